@@ -0,0 +1,42 @@
+"""
+Compares the latency of the Classifier inference backends on CPU,
+and how much of it is spent resizing and normalizing the image.
+Usage: python ClassifierBenchmark.py path/to/keras_model.h5 (or a .tflite model)
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from cvzone.ClassificationModule import Classifier
+
+
+def timeIt(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return np.array(times) * 1000
+
+
+def main(modelPath, repeat=100, batch=20):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    crops = [rng.integers(0, 256, (160, 120, 3), dtype=np.uint8) for _ in range(batch)]
+
+    backends = ("tflite",) if modelPath.endswith(".tflite") else ("predict", "function", "tflite")
+    print(f"{'backend':<10} {'preprocess':>11} {'single p50':>11} {'single p99':>11} {'batch of ' + str(batch):>12}")
+    for backend in backends:
+        # Model loading and warm-up happen in the constructor
+        classifier = Classifier(modelPath, backend=backend)
+        preprocess = timeIt(lambda: classifier._preprocess([img]), repeat)
+        single = timeIt(lambda: classifier.getPrediction(img, draw=False), repeat)
+        batched = timeIt(lambda: classifier.getPredictions(crops), max(1, repeat // 10))
+        print(f"{backend:<10} {np.percentile(preprocess, 50):9.2f}ms {np.percentile(single, 50):9.2f}ms "
+              f"{np.percentile(single, 99):9.2f}ms {np.median(batched):10.2f}ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "keras_model.h5")
@@ -0,0 +1,65 @@
+"""
+Measures how long "import cvzone" takes in a fresh interpreter and checks that it
+does not pull in mediapipe, tensorflow or pyserial. The classes that need them
+are imported on first use, which is timed as well.
+Usage: python ImportBenchmark.py
+"""
+
+import subprocess
+import sys
+
+heavyModules = ("mediapipe", "tensorflow", "serial")
+
+lazyClasses = ("HandDetector", "PoseDetector", "FaceMeshDetector", "FaceDetector", "SelfiSegmentation",
+               "Classifier", "SerialObject", "LivePlot", "PID")
+
+
+def runFresh(code, repeat=5):
+    """
+    Run code in new interpreters and return the fastest of the printed times in ms.
+    If the code fails, return None and the error output.
+    """
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        if output.returncode != 0:
+            return None, output.stderr.strip() or f"exit code {output.returncode}"
+        lines = output.stdout.strip().splitlines()
+        times.append(float(lines[0]))
+    return min(times), lines[1:]
+
+
+def main():
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            "import cvzone\n"
+            "print((time.perf_counter() - start) * 1000)\n"
+            f"print(*[m for m in {heavyModules!r} if m in sys.modules])\n")
+    importTime, loaded = runFresh(code)
+    if importTime is None:
+        print(f"FAIL: import cvzone raised an error\n{loaded}")
+        return 1
+    loaded = " ".join(loaded).split()
+    print(f"import cvzone: {importTime:.1f}ms")
+    if loaded:
+        print(f"FAIL: import cvzone loaded {', '.join(loaded)}")
+    else:
+        print(f"OK: none of {', '.join(heavyModules)} were imported")
+
+    # First access of each lazy class, on top of import cvzone
+    for name in lazyClasses:
+        code = ("import time\n"
+                "import cvzone\n"
+                "start = time.perf_counter()\n"
+                f"cvzone.{name}\n"
+                "print((time.perf_counter() - start) * 1000)\n")
+        accessTime, error = runFresh(code, repeat=1)
+        if accessTime is None:
+            print(f"cvzone.{name:<18} not available: {error.splitlines()[-1]}")
+        else:
+            print(f"cvzone.{name:<18} {accessTime:8.1f}ms")
+    return 1 if loaded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
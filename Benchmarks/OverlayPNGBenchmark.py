@@ -0,0 +1,68 @@
+"""
+Compares the throughput of the float based overlayPNG that cvzone used before
+with the fixed point PNGSprite path, on a 1080p frame.
+"""
+
+import time
+
+import numpy as np
+
+import cvzone
+
+
+def overlayPNGFloat(imgBack, imgFront, pos=[0, 0]):
+    # Previous implementation of cvzone.overlayPNG, kept as the reference
+    hf, wf, cf = imgFront.shape
+    hb, wb, cb = imgBack.shape
+    x1, y1 = max(pos[0], 0), max(pos[1], 0)
+    x2, y2 = min(pos[0] + wf, wb), min(pos[1] + hf, hb)
+    x1_overlay = 0 if pos[0] >= 0 else -pos[0]
+    y1_overlay = 0 if pos[1] >= 0 else -pos[1]
+    wf, hf = x2 - x1, y2 - y1
+    if wf <= 0 or hf <= 0:
+        return imgBack
+    alpha = imgFront[y1_overlay:y1_overlay + hf, x1_overlay:x1_overlay + wf, 3] / 255.0
+    inv_alpha = 1.0 - alpha
+    imgRGB = imgFront[y1_overlay:y1_overlay + hf, x1_overlay:x1_overlay + wf, 0:3]
+    for c in range(0, 3):
+        imgBack[y1:y2, x1:x2, c] = imgBack[y1:y2, x1:x2, c] * inv_alpha + imgRGB[:, :, c] * alpha
+    return imgBack
+
+
+def timeIt(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(size=(256, 256), repeat=500):
+    rng = np.random.default_rng(0)
+    imgBack = rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+    imgFront = rng.integers(0, 256, (size[1], size[0], 4), dtype=np.uint8)
+    pos = [800, 400]
+
+    # Both paths must agree up to rounding
+    expected = overlayPNGFloat(imgBack.copy(), imgFront, pos)
+    result = cvzone.overlayPNG(imgBack.copy(), imgFront, pos)
+    maxDiff = np.abs(expected.astype(int) - result.astype(int)).max()
+
+    sprite = cvzone.PNGSprite(imgFront)
+    imgOut = np.empty_like(imgBack)
+
+    timings = {
+        "overlayPNG (float reference)": timeIt(lambda: overlayPNGFloat(imgBack, imgFront, pos), repeat),
+        "overlayPNG": timeIt(lambda: cvzone.overlayPNG(imgBack, imgFront, pos), repeat),
+        "PNGSprite.overlay": timeIt(lambda: sprite.overlay(imgBack, pos), repeat),
+        "PNGSprite.overlay out=": timeIt(lambda: sprite.overlay(imgBack, pos, out=imgOut), repeat),
+    }
+
+    reference = timings["overlayPNG (float reference)"]
+    print(f"Sprite {size[0]}x{size[1]} on 1920x1080, max difference to reference: {maxDiff}")
+    for name, t in timings.items():
+        print(f"{name:<30} {t * 1e6:9.1f} us  {1 / t:9.0f} ops/s  x{reference / t:.2f}")
+
+
+if __name__ == "__main__":
+    for size, repeat in (((32, 32), 2000), ((256, 256), 500), ((960, 540), 50)):
+        main(size, repeat)
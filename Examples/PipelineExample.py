@@ -0,0 +1,39 @@
+from cvzone.HandTrackingModule import HandDetector
+from cvzone.PipelineModule import Pipeline
+import cvzone
+import cv2
+
+# Initialize the HandDetector class with the given parameters
+detector = HandDetector(staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5)
+
+
+# Runs on the detection thread: only find the hands, do not draw
+def detect(img):
+    hands, img = detector.findHands(img, draw=False)
+    return hands
+
+
+# Runs on the main thread: draw the result of the detection thread
+def render(img, hands):
+    for hand in hands:
+        cvzone.cornerRect(img, hand["bbox"])
+        cvzone.putTextRect(img, hand["type"], (hand["bbox"][0], hand["bbox"][1] - 10), scale=2, thickness=2)
+    return img
+
+
+# Capture, detection and rendering run at the same time on separate threads
+pipeline = Pipeline(0, detect=detect, render=render, queueSize=2)
+pipeline.start()
+
+while True:
+    success, img, hands = pipeline.read()
+    if success:
+        cv2.imshow("Image", img)
+    if cv2.waitKey(1) & 0xFF == ord('q'):
+        break
+
+pipeline.stop()
+
+# Average latency of each stage and how many frames were dropped to stay real time
+for stage, info in pipeline.getStats().items():
+    print(f'{stage}: {info["avgMs"]:.1f} ms, dropped {info["drops"]}')
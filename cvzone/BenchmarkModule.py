@@ -0,0 +1,446 @@
+"""
+Benchmark Module
+Reproducible CPU benchmarks of the cvzone hot functions at several resolutions,
+with a replay harness that feeds recorded mediapipe results to the detectors
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import argparse
+import json
+import pickle
+import platform
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+import cvzone
+from cvzone.LandmarkModule import landmarksToArray
+
+RESOLUTIONS = {"480p": (640, 480), "1080p": (1920, 1080), "4K": (3840, 2160)}
+
+
+def syntheticFrame(resolution, seed=0):
+    """
+    Deterministic test frame: a gradient with filled shapes, so contours can be found.
+    :param resolution: Key of RESOLUTIONS or (width, height)
+    :param seed: Seed of the shape positions and colors
+    :return: BGR image
+    """
+    w, h = RESOLUTIONS.get(resolution, resolution)
+    rng = np.random.default_rng(seed)
+    img = np.empty((h, w, 3), np.uint8)
+    img[:] = np.linspace(0, 255, w, dtype=np.uint8)[None, :, None]
+    for _ in range(12):
+        x, y = int(rng.integers(0, w)), int(rng.integers(0, h))
+        r = int(rng.integers(h // 40, h // 8))
+        color = rng.integers(0, 256, 3).tolist()
+        if rng.random() < 0.5:
+            cv2.circle(img, (x, y), r, color, cv2.FILLED)
+        else:
+            cv2.rectangle(img, (x - r, y - r), (x + r, y + r), color, cv2.FILLED)
+    return img
+
+
+def loadFrame(path, resolution):
+    """
+    First frame of an image or video file, resized to a benchmark resolution.
+    :param path: Image or video path
+    :param resolution: Key of RESOLUTIONS or (width, height)
+    :return: BGR image
+    """
+    img = cv2.imread(path)
+    if img is None:
+        cap = cv2.VideoCapture(path)
+        success, img = cap.read()
+        cap.release()
+        if not success:
+            raise ValueError(f"Could not read a frame from {path}")
+    return cv2.resize(img, RESOLUTIONS.get(resolution, resolution))
+
+
+def measure(func, repeat=50, warmup=3):
+    """
+    Time a function and measure the peak memory it allocates.
+    Memory is traced in a separate call, so tracing does not slow down the timings.
+    :param func: Function without arguments
+    :param repeat: Number of timed calls
+    :param warmup: Number of calls before timing
+    :return: dict with opsPerSec, meanMs, p50Ms, p99Ms and peakMemoryMB
+    """
+    for _ in range(warmup):
+        func()
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        times[i] = time.perf_counter_ns() - start
+    times /= 1e6
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    p50, p99 = np.percentile(times, (50, 99)).tolist()
+    mean = float(times.mean())
+    return {"opsPerSec": 1000 / mean if mean > 0 else 0.0, "meanMs": mean, "p50Ms": p50, "p99Ms": p99,
+            "peakMemoryMB": peak / 2 ** 20}
+
+
+class ReplayModel:
+    """
+    Stands in for a mediapipe solution (Hands, Pose, FaceMesh, ...) and returns
+    recorded results in turn instead of running the model.
+    """
+
+    def __init__(self, results):
+        """
+        :param results: List of recorded results, replayed in a loop
+        """
+        self.results = list(results)
+        self.index = 0
+
+    def process(self, img):
+        result = self.results[self.index % len(self.results)]
+        self.index += 1
+        return result
+
+
+class ResultRecorder:
+    """
+    Wraps the mediapipe solution of a detector and keeps a copy of every result,
+    so a real session can be saved and replayed later with replayDetector.
+    """
+
+    def __init__(self, detector):
+        """
+        :param detector: HandDetector, PoseDetector, FaceMeshDetector, FaceDetector or SelfiSegmentation
+        """
+        self.attribute = _modelAttribute(detector)
+        self.model = getattr(detector, self.attribute)
+        self.results = []
+        setattr(detector, self.attribute, self)
+
+    def process(self, img):
+        result = self.model.process(img)
+        # mediapipe returns the SolutionOutputs namedtuple class itself, with the fields as class attributes
+        if hasattr(result, "_fields"):
+            fields = {key: getattr(result, key) for key in result._fields}
+        else:
+            fields = vars(result)
+        self.results.append(SimpleNamespace(**{key: value.copy() if isinstance(value, np.ndarray) else value
+                                               for key, value in fields.items()}))
+        return result
+
+    def save(self, path):
+        """
+        :param path: File to write the recorded results to
+        """
+        with open(path, "wb") as f:
+            pickle.dump(self.results, f)
+
+
+def loadResults(path):
+    """
+    :param path: File written by ResultRecorder.save
+    :return: List of recorded results
+    """
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# Attribute holding the mediapipe solution in each detector class
+_modelAttributes = {"HandDetector": "hands", "PoseDetector": "pose", "FaceMeshDetector": "faceMesh",
+                    "FaceDetector": "faceDetection", "SelfiSegmentation": "selfieSegmentation"}
+
+
+def _modelAttribute(detector):
+    for cls in type(detector).__mro__:
+        if cls.__name__ in _modelAttributes:
+            return _modelAttributes[cls.__name__]
+    raise ValueError("detector must be a HandDetector, PoseDetector, FaceMeshDetector, FaceDetector "
+                     "or SelfiSegmentation")
+
+
+def replayDetector(detector, results):
+    """
+    Replace the mediapipe model of a detector with recorded results, so only the
+    cvzone code around the model runs.
+    :param detector: HandDetector, PoseDetector, FaceMeshDetector, FaceDetector or SelfiSegmentation
+    :param results: List of results from ResultRecorder, loadResults or the synthetic* functions
+    :return: The detector
+    """
+    setattr(detector, _modelAttribute(detector), ReplayModel(results))
+    return detector
+
+
+def _landmarkList(n, rng, visibility=False):
+    from mediapipe.framework.formats import landmark_pb2
+
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in rng.uniform(0.1, 0.9, (n, 3)).tolist():
+        lm = landmarks.landmark.add()
+        lm.x, lm.y, lm.z = x, y, (z - 0.5) * 0.1
+        if visibility:
+            lm.visibility = 0.9
+    return landmarks
+
+
+def syntheticHandResults(numHands=2, seed=0):
+    """Hands result with random landmarks, in the format of mediapipe Hands.process."""
+    from mediapipe.framework.formats import classification_pb2
+
+    rng = np.random.default_rng(seed)
+    handedness = []
+    for i in range(numHands):
+        classification = classification_pb2.ClassificationList()
+        label = classification.classification.add()
+        label.label, label.score = ("Left", "Right")[i % 2], 0.95
+        handedness.append(classification)
+    return SimpleNamespace(multi_hand_landmarks=[_landmarkList(21, rng) for _ in range(numHands)] or None,
+                           multi_handedness=handedness or None)
+
+
+def syntheticPoseResults(seed=0):
+    """Pose result with random landmarks, in the format of mediapipe Pose.process."""
+    rng = np.random.default_rng(seed)
+    return SimpleNamespace(pose_landmarks=_landmarkList(33, rng, visibility=True), segmentation_mask=None)
+
+
+def syntheticFaceMeshResults(numFaces=1, numLandmarks=468, seed=0):
+    """Face mesh result with random landmarks, in the format of mediapipe FaceMesh.process."""
+    rng = np.random.default_rng(seed)
+    return SimpleNamespace(multi_face_landmarks=[_landmarkList(numLandmarks, rng) for _ in range(numFaces)] or None)
+
+
+def syntheticFaceResults(numFaces=2, seed=0):
+    """Face detection result with random boxes, in the format of mediapipe FaceDetection.process."""
+    from mediapipe.framework.formats import detection_pb2
+
+    rng = np.random.default_rng(seed)
+    detections = []
+    for _ in range(numFaces):
+        detection = detection_pb2.Detection()
+        detection.score.append(0.95)
+        box = detection.location_data.relative_bounding_box
+        box.xmin, box.ymin = rng.uniform(0.1, 0.6, 2).tolist()
+        box.width, box.height = rng.uniform(0.1, 0.3, 2).tolist()
+        detections.append(detection)
+    return SimpleNamespace(detections=detections or None)
+
+
+def syntheticSegmentationResults(w, h, seed=0):
+    """Selfie segmentation result with a random mask, in the format of SelfieSegmentation.process."""
+    rng = np.random.default_rng(seed)
+    mask = cv2.resize(rng.random((h // 16, w // 16), dtype=np.float32), (w, h))
+    return SimpleNamespace(segmentation_mask=mask)
+
+
+class BenchmarkSuite:
+    """
+    Named benchmark cases run at several resolutions. Each case is a setup
+    function that gets the frame and returns the function to time.
+    """
+
+    def __init__(self):
+        self.cases = {}
+
+    def add(self, name, setup):
+        """
+        :param name: Name of the case e.g. "overlayPNG"
+        :param setup: Function (frame) -> function without arguments to benchmark
+        """
+        self.cases[name] = setup
+
+    def run(self, resolutions=("480p", "1080p", "4K"), repeat=50, warmup=3, names=None, frames=None,
+            verbose=True):
+        """
+        :param resolutions: Keys of RESOLUTIONS
+        :param repeat: Number of timed calls per case
+        :param warmup: Number of calls before timing
+        :param names: Only run the cases whose name contains one of these strings
+        :param frames: Optional dict {resolution: frame} to use instead of the synthetic frames
+        :param verbose: Print each result as it is measured
+        :return: dict with "meta" (versions and platform) and "results" {"name/resolution": stats}
+        """
+        results = {}
+        for resolution in resolutions:
+            for name, setup in self.cases.items():
+                if names and not any(part in name for part in names):
+                    continue
+                frame = frames[resolution].copy() if frames else syntheticFrame(resolution)
+                try:
+                    func = setup(frame)
+                except ImportError as error:
+                    if verbose:
+                        print(f"{name + '/' + resolution:<32} skipped: {error}")
+                    continue
+                stats = measure(func, repeat, warmup)
+                stats.update(name=name, resolution=resolution)
+                results[f"{name}/{resolution}"] = stats
+                if verbose:
+                    print(f"{name + '/' + resolution:<32} {stats['opsPerSec']:10.1f} ops/s  "
+                          f"p50 {stats['p50Ms']:8.3f} ms  p99 {stats['p99Ms']:8.3f} ms  "
+                          f"peak {stats['peakMemoryMB']:7.2f} MB")
+        return {"meta": _environment(), "results": results}
+
+
+def _environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "opencv": cv2.__version__,
+            "platform": platform.platform(), "processor": platform.processor(), "time": time.time()}
+
+
+def saveResults(results, path):
+    """
+    :param results: Output of BenchmarkSuite.run
+    :param path: JSON file to write
+    """
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def compareResults(results, baseline, tolerance=0.15, metric="p50Ms"):
+    """
+    Compare benchmark results with a saved baseline.
+    :param results: Output of BenchmarkSuite.run
+    :param baseline: Output of an earlier run, or the path of its JSON file
+    :param tolerance: Allowed slowdown as a fraction, 0.15 = 15% slower is still ok
+    :param metric: Latency to compare, "p50Ms", "p99Ms" or "meanMs"
+    :return: List of dicts with key, baseline, current, ratio and status
+             ("regression", "improvement" or "ok") for the cases found in both
+    """
+    if isinstance(baseline, str):
+        with open(baseline) as f:
+            baseline = json.load(f)
+    comparison = []
+    for key, stats in results["results"].items():
+        if key not in baseline["results"]:
+            continue
+        before, now = baseline["results"][key][metric], stats[metric]
+        ratio = now / before if before > 0 else 1.0
+        status = "regression" if ratio > 1 + tolerance else "improvement" if ratio < 1 / (1 + tolerance) else "ok"
+        comparison.append({"key": key, "baseline": before, "current": now, "ratio": ratio, "status": status})
+    return comparison
+
+
+def defaultSuite():
+    """
+    Cases for the drawing and image helpers, landmark conversion and the
+    post-processing of every detector, with replayed synthetic mediapipe results.
+    :return: BenchmarkSuite
+    """
+    suite = BenchmarkSuite()
+    detectors = {}
+
+    def detector(cls, **kwargs):
+        # Detectors are created once, their models are replaced by replayed results
+        if cls.__name__ not in detectors:
+            detectors[cls.__name__] = cls(**kwargs)
+        return detectors[cls.__name__]
+
+    def overlay(frame):
+        h, w = frame.shape[:2]
+        imgFront = cv2.cvtColor(cv2.resize(syntheticFrame((w // 4, h // 4), seed=1), (w // 4, h // 4)),
+                                cv2.COLOR_BGR2BGRA)
+        imgFront[:, :, 3] = np.linspace(0, 255, w // 4, dtype=np.uint8)[None, :]
+        return lambda: cvzone.overlayPNG(frame, imgFront, [w // 8, h // 8])
+
+    def contours(frame):
+        imgPre = cv2.Canny(frame, 50, 150)
+        return lambda: cvzone.findContours(frame, imgPre, minArea=1000)
+
+    def corner(frame):
+        h, w = frame.shape[:2]
+        return lambda: cvzone.cornerRect(frame, (w // 4, h // 4, w // 2, h // 2))
+
+    def handLandmarks(frame):
+        h, w = frame.shape[:2]
+        multiLandmarks = syntheticHandResults(2).multi_hand_landmarks
+        return lambda: landmarksToArray(multiLandmarks, w, h)
+
+    def faceLandmarks(frame):
+        h, w = frame.shape[:2]
+        multiLandmarks = syntheticFaceMeshResults(1).multi_face_landmarks
+        return lambda: landmarksToArray(multiLandmarks, w, h)
+
+    def hands(frame):
+        from cvzone.HandTrackingModule import HandDetector
+        handDetector = replayDetector(detector(HandDetector, maxHands=2), [syntheticHandResults(2)])
+        return lambda: handDetector.findHands(frame, draw=True)
+
+    def pose(frame):
+        from cvzone.PoseModule import PoseDetector
+        poseDetector = replayDetector(detector(PoseDetector), [syntheticPoseResults()])
+
+        def run():
+            poseDetector.findPose(frame, draw=True)
+            return poseDetector.findPosition(frame, draw=True)
+        return run
+
+    def faceMesh(frame):
+        from cvzone.FaceMeshModule import FaceMeshDetector
+        meshDetector = replayDetector(detector(FaceMeshDetector, maxFaces=1), [syntheticFaceMeshResults(1)])
+        return lambda: meshDetector.findFaceMesh(frame, draw=True)
+
+    def faces(frame):
+        from cvzone.FaceDetectionModule import FaceDetector
+        faceDetector = replayDetector(detector(FaceDetector), [syntheticFaceResults(2)])
+        return lambda: faceDetector.findFaces(frame, draw=True)
+
+    def segmentation(frame):
+        from cvzone.SelfiSegmentationModule import SelfiSegmentation
+        h, w = frame.shape[:2]
+        segmentor = replayDetector(detector(SelfiSegmentation), [syntheticSegmentationResults(w, h)])
+        return lambda: segmentor.removeBG(frame, imgBg=(255, 0, 255))
+
+    suite.add("overlayPNG", overlay)
+    suite.add("stackImages", lambda frame: lambda: cvzone.stackImages([frame] * 4, 2, 0.5))
+    suite.add("findContours", contours)
+    suite.add("rotateImage", lambda frame: lambda: cvzone.rotateImage(frame, 30))
+    suite.add("putTextRect", lambda frame: lambda: cvzone.putTextRect(frame, "cvzone benchmark", (50, 100)))
+    suite.add("cornerRect", corner)
+    suite.add("landmarksToArray.hands", handLandmarks)
+    suite.add("landmarksToArray.faceMesh", faceLandmarks)
+    suite.add("replay.findHands", hands)
+    suite.add("replay.findPose", pose)
+    suite.add("replay.findFaceMesh", faceMesh)
+    suite.add("replay.findFaces", faces)
+    suite.add("replay.removeBG", segmentation)
+    return suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cvzone hot functions on CPU")
+    parser.add_argument("--resolutions", nargs="+", default=["480p", "1080p", "4K"], choices=list(RESOLUTIONS))
+    parser.add_argument("--repeat", type=int, default=50, help="timed calls per case")
+    parser.add_argument("--filter", nargs="+", help="only run cases whose name contains one of these")
+    parser.add_argument("--image", help="image or video to use instead of the synthetic frames")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p50 slowdown, 0.15 = 15%%")
+    args = parser.parse_args()
+
+    frames = {resolution: loadFrame(args.image, resolution) for resolution in args.resolutions} \
+        if args.image else None
+    results = defaultSuite().run(args.resolutions, args.repeat, names=args.filter, frames=frames)
+    if args.output:
+        saveResults(results, args.output)
+
+    if args.baseline:
+        comparison = compareResults(results, args.baseline, args.tolerance)
+        for row in comparison:
+            print(f"{row['key']:<32} {row['baseline']:8.3f} ms -> {row['current']:8.3f} ms  "
+                  f"x{row['ratio']:.2f}  {row['status']}")
+        if any(row["status"] == "regression" for row in comparison):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
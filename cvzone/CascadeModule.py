@@ -0,0 +1,177 @@
+"""
+Cascade Module
+Runs the hand and face mesh models only around the people found by a cheaper detector
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import cv2
+import numpy as np
+
+from cvzone.Utils import SharedFrame
+
+# Pose landmarks of the left and right hand: elbow, wrist, pinky, index, thumb
+_handLandmarks = ((13, 15, 17, 19, 21), (14, 16, 18, 20, 22))
+# Pose landmarks of the face: nose, eyes, ears and mouth
+_faceLandmarks = tuple(range(11))
+
+
+def expandRegion(bbox, margin, w, h):
+    """
+    Grow a box on every side and clip it to the image.
+    :param bbox: x, y, w, h
+    :param margin: Added on every side as a fraction of the larger side of the box
+    :param w: Image width
+    :param h: Image height
+    :return: x1, y1, x2, y2, or None if nothing is left inside the image
+    """
+    x, y, bw, bh = bbox
+    pad = int(max(bw, bh) * margin)
+    x1, y1 = max(int(x) - pad, 0), max(int(y) - pad, 0)
+    x2, y2 = min(int(x + bw) + pad, w), min(int(y + bh) + pad, h)
+    if x2 - x1 < 2 or y2 - y1 < 2:
+        return None
+    return x1, y1, x2, y2
+
+
+def unionRegion(regions):
+    """
+    :param regions: List of x1, y1, x2, y2 boxes, None entries are ignored
+    :return: The smallest x1, y1, x2, y2 box around all of them, or None
+    """
+    regions = np.array([region for region in regions if region is not None]).reshape(-1, 4)
+    if len(regions) == 0:
+        return None
+    x1, y1 = regions[:, :2].min(axis=0).tolist()
+    x2, y2 = regions[:, 2:].max(axis=0).tolist()
+    return x1, y1, x2, y2
+
+
+class CascadeDetector:
+    """
+    Runs a cheap PoseDetector or FaceDetector on the full frame first. The
+    HandDetector and FaceMeshDetector then only process a crop around the
+    wrists and faces it found, and their landmarks are mapped back to the full
+    frame. Frames without people cost one light inference.
+    All regions of a model are merged into one crop per frame, so a HandDetector
+    in tracking mode keeps seeing a consistent region.
+    """
+
+    def __init__(self, primary, handDetector=None, faceMeshDetector=None,
+                 handMargin=0.8, faceMargin=0.25, minVisibility=0.5):
+        """
+        :param primary: PoseDetector or FaceDetector run on the full frame
+        :param handDetector: HandDetector run around the wrists (PoseDetector only)
+        :param faceMeshDetector: FaceMeshDetector run around the faces
+        :param handMargin: Space around the hand landmarks of the pose, as a fraction of the forearm length
+        :param faceMargin: Space around the faces, as a fraction of the face size
+        :param minVisibility: Minimum pose landmark visibility to look for a hand or face there
+        """
+        if hasattr(primary, "findPosition"):
+            self.kind = "pose"
+        elif hasattr(primary, "findFaces"):
+            self.kind = "faces"
+            if handDetector is not None:
+                raise ValueError("handDetector needs a PoseDetector as the primary detector")
+        else:
+            raise ValueError("primary must be a PoseDetector or FaceDetector")
+        self.primary = primary
+        self.handDetector = handDetector
+        self.faceMeshDetector = faceMeshDetector
+        self.handMargin = handMargin
+        self.faceMargin = faceMargin
+        self.minVisibility = minVisibility
+        self.regions = {"hands": None, "faceMesh": None}
+
+    def _poseRegions(self, lmArray, w, h):
+        """
+        Hand and face regions from the pose landmarks (33, 4) with visibility.
+        """
+        handRegions = []
+        for elbow, *hand in _handLandmarks:
+            if lmArray[hand[0], 3] < self.minVisibility:
+                continue
+            points = lmArray[hand, :2]
+            forearm = np.linalg.norm(lmArray[hand[0], :2] - lmArray[elbow, :2])
+            x1, y1 = points.min(axis=0) - forearm * self.handMargin
+            x2, y2 = points.max(axis=0) + forearm * self.handMargin
+            handRegions.append(expandRegion((x1, y1, x2 - x1, y2 - y1), 0, w, h))
+
+        faceRegion = None
+        face = lmArray[list(_faceLandmarks)]
+        visible = face[face[:, 3] >= self.minVisibility, :2]
+        if len(visible) >= 3:
+            x1, y1 = visible.min(axis=0)
+            x2, y2 = visible.max(axis=0)
+            # The face landmarks of the pose do not reach the forehead and chin
+            faceRegion = expandRegion((x1, y1, x2 - x1, y2 - y1), 0.5 + self.faceMargin, w, h)
+        return unionRegion(handRegions), faceRegion
+
+    def find(self, img, draw=True, rgb=None):
+        """
+        Find the people, then their hands and face meshes.
+        :param img: BGR image
+        :param draw: Flag to draw the output on the image
+        :param rgb: RGB version of img e.g. SharedFrame.rgb, converted here if None
+        :return: dict with "pose" (lmList, bboxInfo) or "faces" (bbox info list) of the primary detector,
+                 "hands" (list of hands from findHands), "faceMesh" (list of faces from findFaceMesh)
+                 and "regions" {"hands": x1, y1, x2, y2 or None, "faceMesh": ...} that were processed
+        """
+        if rgb is None:
+            rgb = SharedFrame(img).rgb
+        h, w = img.shape[:2]
+        output = {}
+
+        if self.kind == "pose":
+            self.primary.findPose(img, draw=draw, rgb=rgb)
+            output["pose"] = self.primary.findPosition(img, draw=False)
+            if len(self.primary.lmArray):
+                handRegion, faceRegion = self._poseRegions(self.primary.lmArray, w, h)
+            else:
+                handRegion = faceRegion = None
+        else:
+            img, bboxs = self.primary.findFaces(img, draw=draw, rgb=rgb)
+            output["faces"] = bboxs
+            handRegion = None
+            faceRegion = unionRegion([expandRegion(bboxInfo["bbox"], self.faceMargin, w, h) for bboxInfo in bboxs])
+        self.regions = {"hands": handRegion, "faceMesh": faceRegion}
+
+        hands, faces = [], []
+        if self.handDetector is not None and handRegion is not None:
+            hands, img = self.handDetector.findHands(img, draw=draw, rgb=rgb, roi=handRegion)
+        if self.faceMeshDetector is not None and faceRegion is not None:
+            img, faces = self.faceMeshDetector.findFaceMesh(img, draw=draw, rgb=rgb, roi=faceRegion)
+        output["hands"] = hands
+        output["faceMesh"] = faces
+        output["regions"] = dict(self.regions)
+
+        if draw:
+            for region in self.regions.values():
+                if region is not None:
+                    cv2.rectangle(img, region[:2], region[2:], (0, 255, 255), 1)
+        return output
+
+
+def main():
+    from cvzone.HandTrackingModule import HandDetector
+    from cvzone.PoseModule import PoseDetector
+    from cvzone.FaceMeshModule import FaceMeshDetector
+
+    cap = cv2.VideoCapture(0)
+    cascade = CascadeDetector(PoseDetector(), handDetector=HandDetector(maxHands=2),
+                              faceMeshDetector=FaceMeshDetector(maxFaces=1))
+
+    while True:
+        success, img = cap.read()
+
+        # Hands and face mesh only run inside the yellow regions around the person
+        output = cascade.find(img, draw=True)
+        print(len(output["hands"]), "hands", len(output["faceMesh"]), "faces", output["regions"])
+
+        cv2.imshow("Image", img)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+
+if __name__ == "__main__":
+    main()
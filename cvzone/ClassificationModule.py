@@ -9,27 +9,78 @@ import cv2
 import numpy as np
 import tensorflow
 
+# Color conversions from the channels of an image to the channels of the model input
+_channelConversions = {(1, 3): cv2.COLOR_GRAY2BGR, (4, 3): cv2.COLOR_BGRA2BGR,
+                       (3, 1): cv2.COLOR_BGR2GRAY, (4, 1): cv2.COLOR_BGRA2GRAY}
+
 
 class Classifier:
     """
     Classifier class that handles image classification using a pre-trained Keras model.
     """
 
-    def __init__(self, modelPath, labelsPath=None):
+    def __init__(self, modelPath, labelsPath=None, backend="predict"):
         """
         Initializes the Classifier with the model and labels.
 
-        :param modelPath: str, path to the Keras model
+        :param modelPath: str, path to the Keras model, or to a .tflite model (e.g. the quantized
+                          Teachable Machine export), which always uses the "tflite" backend
         :param labelsPath: str, path to the labels file (optional)
+        :param backend: str, how inference is run:
+                        "predict" uses model.predict,
+                        "function" calls the model through a compiled tf.function (lower latency per call),
+                        "tflite" converts the model once to TensorFlow Lite and runs it with the interpreter
         """
         self.model_path = modelPath
         np.set_printoptions(suppress=True)  # Disable scientific notation for clarity
 
-        # Load the Keras model
-        self.model = tensorflow.keras.models.load_model(self.model_path)
+        if backend not in ("predict", "function", "tflite"):
+            raise ValueError('backend must be "predict", "function" or "tflite"')
+
+        # Load the model
+        if self.model_path.endswith(".tflite"):
+            backend = "tflite"
+            self.model = None
+            self.interpreter = tensorflow.lite.Interpreter(model_path=self.model_path)
+        else:
+            self.model = tensorflow.keras.models.load_model(self.model_path)
+            if backend == "tflite":
+                converter = tensorflow.lite.TFLiteConverter.from_keras_model(self.model)
+                self.interpreter = tensorflow.lite.Interpreter(model_content=converter.convert())
+        self.backend = backend
+
+        # Read the input shape and dtype from the model, e.g. (224, 224, 3) float32, or uint8 for a quantized model
+        inputQuantization = (0.0, 0)
+        self.outputQuantization = None
+        if backend == "tflite":
+            self.interpreter.allocate_tensors()
+            inputDetails = self.interpreter.get_input_details()[0]
+            outputDetails = self.interpreter.get_output_details()[0]
+            self.inputIndex = inputDetails["index"]
+            self.outputIndex = outputDetails["index"]
+            self.batchSize = 1
+            inputShape = tuple(inputDetails["shape"][1:].tolist())
+            inputDtype = np.dtype(inputDetails["dtype"])
+            inputQuantization = inputDetails["quantization"]
+            if np.dtype(outputDetails["dtype"]).kind in "iu":
+                self.outputQuantization = outputDetails["quantization"]
+        else:
+            inputShape = tuple(self.model.input_shape[1:])
+            inputDtype = np.dtype(tensorflow.as_dtype(self.model.inputs[0].dtype).as_numpy_dtype)
+        self.inputSize = (inputShape[1], inputShape[0])
+
+        # Preallocated input tensor, and uint8 staging buffer the images are resized into
+        self.data = np.zeros(shape=(1,) + inputShape, dtype=inputDtype)
+        self.resized = np.zeros(shape=(1,) + inputShape, dtype=np.uint8)
+        self.lut = self._makeLut(inputDtype, inputQuantization)
 
-        # Create a NumPy array with the right shape to feed into the Keras model
-        self.data = np.ndarray(shape=(1, 224, 224, 3), dtype=np.float32)
+        if backend == "function":
+            self.function = tensorflow.function(
+                lambda x: self.model(x, training=False),
+                input_signature=[tensorflow.TensorSpec((None,) + inputShape, tensorflow.as_dtype(inputDtype))])
+
+        # Warm up the backend, so the first frame is not slow
+        self._infer(self.data)
 
         self.labels_path = labelsPath
 
@@ -41,6 +92,100 @@ class Classifier:
         else:
             print("No Labels Found")
 
+    @staticmethod
+    def _makeLut(dtype, quantization):
+        """
+        Lookup table from uint8 pixels to model input values, normalized to [-1, 1].
+
+        :param dtype: dtype of the model input
+        :param quantization: (scale, zeroPoint) of a quantized input, scale 0 if not quantized
+        :return: table of 256 values, None if the pixels can be fed unchanged
+        """
+        values = np.arange(256) / 127.0 - 1
+        if dtype.kind == "f":
+            return values.astype(dtype)
+        scale, zeroPoint = quantization
+        if scale == 0:
+            values = np.arange(256)
+        else:
+            info = np.iinfo(dtype)
+            values = np.clip(np.round(values / scale + zeroPoint), info.min, info.max)
+        if dtype == np.uint8 and np.array_equal(values, np.arange(256)):
+            return None
+        return values.astype(dtype)
+
+    def _toModelChannels(self, img):
+        """
+        Convert an image to the channels of the model input. cv2.resize only writes into
+        the preallocated slot if the image has the same format as the slot.
+
+        :param img: uint8 image, grayscale, BGR or BGRA
+        :return: the image, converted if its channels differ from the model input
+        """
+        if img.dtype != np.uint8:
+            raise ValueError(f"Images must be uint8, got {img.dtype}")
+        imgChannels = 1 if img.ndim == 2 else img.shape[2]
+        modelChannels = self.data.shape[3]
+        if imgChannels == modelChannels:
+            return img
+        if (imgChannels, modelChannels) not in _channelConversions:
+            raise ValueError(f"Can not convert an image with {imgChannels} channels "
+                             f"to the {modelChannels} channels of the model input")
+        return cv2.cvtColor(img, _channelConversions[imgChannels, modelChannels])
+
+    def _preprocess(self, imgs):
+        """
+        Resize and normalize images into the preallocated input tensor.
+
+        :param imgs: list of images
+        :return: view of the input tensor holding the images
+        """
+        n = len(imgs)
+        if n > len(self.data):
+            self.data = np.zeros(shape=(n,) + self.data.shape[1:], dtype=self.data.dtype)
+            self.resized = np.zeros(shape=(n,) + self.resized.shape[1:], dtype=np.uint8)
+
+        # Resize every image into its slot and normalize it with one table lookup per pixel.
+        # Quantized models that take the pixels unchanged are resized straight into the input.
+        for i, img in enumerate(imgs):
+            img = self._toModelChannels(img)
+            if self.lut is None:
+                cv2.resize(img, self.inputSize, dst=self.data[i])
+            else:
+                cv2.resize(img, self.inputSize, dst=self.resized[i])
+                cv2.LUT(self.resized[i], self.lut, dst=self.data[i])
+        return self.data[:n]
+
+    def _infer(self, data):
+        """
+        Run the model on a batch with the selected backend.
+
+        :param data: input batch (n, height, width, channels)
+        :return: predictions as a NumPy array (n, numClasses)
+        """
+        if self.backend == "function":
+            return self.function(data).numpy()
+        if self.backend == "tflite":
+            # The interpreter is allocated for the largest batch seen so far, smaller
+            # batches are zero padded, so a changing number of crops does not reallocate it
+            n = len(data)
+            if n > self.batchSize:
+                self.interpreter.resize_tensor_input(self.inputIndex, data.shape)
+                self.interpreter.allocate_tensors()
+                self.batchSize = n
+            elif n < self.batchSize:
+                # data is the start of self.data, which is never smaller than the allocated batch
+                self.data[n:self.batchSize] = 0
+                data = self.data[:self.batchSize]
+            self.interpreter.set_tensor(self.inputIndex, data)
+            self.interpreter.invoke()
+            prediction = self.interpreter.get_tensor(self.outputIndex)[:n]
+            if self.outputQuantization is not None:
+                scale, zeroPoint = self.outputQuantization
+                prediction = (prediction.astype(np.float32) - zeroPoint) * scale
+            return prediction
+        return self.model.predict(data)
+
     def getPrediction(self, img, draw=True, pos=(50, 50), scale=2, color=(0, 255, 0)):
         """
         Classifies the image and optionally draws the result on the image.
@@ -52,16 +197,11 @@ class Classifier:
         :param color: text color
         :return: list of predictions, index of the most likely prediction
         """
-        # Resize and normalize the image
-        imgS = cv2.resize(img, (224, 224))
-        image_array = np.asarray(imgS)
-        normalized_image_array = (image_array.astype(np.float32) / 127.0) - 1
-
-        # Load the image into the data array
-        self.data[0] = normalized_image_array
+        # Resize and normalize the image into the data array
+        data = self._preprocess([img])
 
         # Run inference
-        prediction = self.model.predict(self.data)
+        prediction = self._infer(data)
         indexVal = np.argmax(prediction)
 
         # Draw the prediction text on the image if specified
@@ -70,6 +210,35 @@ class Classifier:
 
         return list(prediction[0]), indexVal
 
+    def getPredictions(self, imgs, draw=False, pos=(50, 50), scale=2, color=(0, 255, 0), asArray=False):
+        """
+        Classifies many images, e.g. all face crops of a frame, with a single inference call.
+
+        :param imgs: list of images to classify
+        :param draw: whether to draw each prediction on its image
+        :param pos: position where to draw the text
+        :param scale: font scale
+        :param color: text color
+        :param asArray: return NumPy arrays instead of lists
+        :return: predictions of every image (n, numClasses), index of the most likely prediction of every image (n,)
+        """
+        if len(imgs) == 0:
+            if asArray:
+                return np.zeros((0, 0), np.float32), np.zeros(0, np.int64)
+            return [], []
+
+        data = self._preprocess(imgs)
+        predictions = self._infer(data)
+        indexVals = np.argmax(predictions, axis=1)
+
+        if draw and self.labels_path:
+            for img, indexVal in zip(imgs, indexVals.tolist()):
+                cv2.putText(img, str(self.list_labels[indexVal]), pos, cv2.FONT_HERSHEY_COMPLEX, scale, color, 2)
+
+        if asArray:
+            return predictions, indexVals
+        return [list(prediction) for prediction in predictions], indexVals.tolist()
+
 
 if __name__ == "__main__":
     cap = cv2.VideoCapture(2)  # Initialize video capture
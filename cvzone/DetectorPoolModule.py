@@ -0,0 +1,209 @@
+"""
+Detector Pool Module
+Runs cvzone detectors on many CPU cores for offline video processing
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import collections
+import multiprocessing as mp
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+
+def detectHands(detector, img, rgb=None):
+    """Detect function for HandDetector, returns the list of hands."""
+    hands, img = detector.findHands(img, draw=False, rgb=rgb)
+    return hands
+
+
+def detectPose(detector, img, rgb=None):
+    """Detect function for PoseDetector, returns (lmList, bboxInfo)."""
+    detector.findPose(img, draw=False, rgb=rgb)
+    return detector.findPosition(img, draw=False)
+
+
+def detectFaceMesh(detector, img, rgb=None):
+    """Detect function for FaceMeshDetector, returns the list of faces."""
+    img, faces = detector.findFaceMesh(img, draw=False, rgb=rgb)
+    return faces
+
+
+def detectFaces(detector, img, rgb=None):
+    """Detect function for FaceDetector, returns the list of bbox info."""
+    img, bboxs = detector.findFaces(img, draw=False, rgb=rgb)
+    for bboxInfo in bboxs:
+        # The mediapipe score container can not be pickled
+        bboxInfo["score"] = list(bboxInfo["score"])
+    return bboxs
+
+
+# State of each worker process, created once by _initWorker
+_worker = {}
+
+
+def _initWorker(detectorClass, detectorArgs, detect):
+    _worker["detector"] = detectorClass(**detectorArgs)
+    _worker["detect"] = detect
+    _worker["buffers"] = {}
+
+
+def _processSlot(shmName, slot, shape, dtype):
+    # Attach to the shared block once per worker and read the frame without copying it
+    buffers = _worker["buffers"]
+    if shmName not in buffers:
+        for oldShm, oldViews in buffers.values():
+            oldViews.clear()
+            oldShm.close()
+        buffers.clear()
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=shmName, track=False)
+        else:
+            # The worker shares the resource tracker of the parent, which owns and unlinks the block
+            shm = shared_memory.SharedMemory(name=shmName)
+        buffers[shmName] = shm, {}
+    shm, views = buffers[shmName]
+    key = (slot, shape, dtype)
+    if key not in views:
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        views[key] = np.ndarray(shape, dtype, buffer=shm.buf, offset=slot * size)
+    return _worker["detect"](_worker["detector"], views[key])
+
+
+def _processVideo(path):
+    results = []
+    cap = cv2.VideoCapture(path)
+    while True:
+        success, img = cap.read()
+        if not success:
+            break
+        results.append(_worker["detect"](_worker["detector"], img))
+    cap.release()
+    return results
+
+
+class DetectorPool:
+    """
+    Process pool where every worker owns its own detector instance.
+    Frames are passed to the workers through shared memory instead of being
+    pickled, and results are returned in input order. Whole video files can
+    also be spread over the workers.
+    """
+
+    def __init__(self, detectorClass, detectorArgs=None, detect=detectHands, processes=None, slotsPerProcess=2):
+        """
+        :param detectorClass: Detector class to create in each worker e.g. HandDetector
+        :param detectorArgs: dict of keyword arguments for the detector e.g. {"staticMode": True}
+        :param detect: Top level function (detector, img) -> result. Results must be picklable.
+                       detectHands, detectPose, detectFaceMesh and detectFaces are provided.
+        :param processes: Number of worker processes, defaults to the number of cores
+        :param slotsPerProcess: Frames in flight per worker
+        """
+        self.processes = processes or mp.cpu_count()
+        self.numSlots = self.processes * slotsPerProcess
+        # Start the resource tracker before the workers, so they share it instead of starting their own
+        resource_tracker.ensure_running()
+        self.pool = mp.Pool(self.processes, initializer=_initWorker,
+                            initargs=(detectorClass, detectorArgs or {}, detect))
+        self.shm = None
+        self.frameShape = None
+        self.frameDtype = None
+
+    def _allocate(self, img):
+        self._release()
+        self.frameShape, self.frameDtype = img.shape, img.dtype.str
+        self.shm = shared_memory.SharedMemory(create=True, size=img.nbytes * self.numSlots)
+        self.slots = [np.ndarray(img.shape, img.dtype, buffer=self.shm.buf, offset=i * img.nbytes)
+                      for i in range(self.numSlots)]
+
+    def _release(self):
+        if self.shm is not None:
+            self.slots = []
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def imap(self, frames):
+        """
+        Run the detector over frames on all workers.
+        :param frames: Iterable of images
+        :return: Generator of results in the same order as the frames
+        """
+        pending = collections.deque()
+        # Nothing is in flight at the start of a call, so every slot of the current block is free
+        freeSlots = collections.deque(range(self.numSlots))
+        for img in frames:
+            if self.shm is None or img.shape != self.frameShape or img.dtype.str != self.frameDtype:
+                # Frame size changed: finish the frames in flight before reallocating
+                while pending:
+                    yield pending.popleft()[1].get()
+                self._allocate(img)
+                freeSlots = collections.deque(range(self.numSlots))
+            if not freeSlots:
+                slot, result = pending.popleft()
+                freeSlots.append(slot)
+                yield result.get()
+            slot = freeSlots.popleft()
+            np.copyto(self.slots[slot], img)
+            pending.append((slot, self.pool.apply_async(
+                _processSlot, (self.shm.name, slot, self.frameShape, self.frameDtype))))
+        while pending:
+            yield pending.popleft()[1].get()
+
+    def map(self, frames):
+        """
+        :param frames: Iterable of images
+        :return: List of results in the same order as the frames
+        """
+        return list(self.imap(frames))
+
+    def mapVideos(self, paths):
+        """
+        Process whole video files, one file per worker at a time.
+        :param paths: List of video paths
+        :return: List with the per frame results of each video, in the order of paths
+        """
+        return self.pool.map(_processVideo, paths, chunksize=1)
+
+    def close(self):
+        self._release()
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main():
+    import sys
+    import time
+
+    from cvzone.HandTrackingModule import HandDetector
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "video.mp4"
+
+    with DetectorPool(HandDetector, {"staticMode": True, "maxHands": 2}, detect=detectHands) as pool:
+        # Read the frames here and let the workers find the hands
+        cap = cv2.VideoCapture(path)
+
+        def frames():
+            while True:
+                success, img = cap.read()
+                if not success:
+                    return
+                yield img
+
+        start = time.time()
+        for i, hands in enumerate(pool.imap(frames())):
+            print(i, len(hands))
+        print(f"{pool.processes} processes: {time.time() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
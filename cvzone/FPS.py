@@ -4,30 +4,101 @@ By: Computer Vision Zone
 Website: https://www.computervision.zone/
 """
 
+import contextlib
 import time
+
 import cv2
+import numpy as np
+
 import cvzone
 
 
+class _TimingWindow:
+    """
+    Durations of the last n events in a fixed ring buffer, with an O(1) running mean and EMA.
+    Percentiles are only computed when asked for.
+    """
+
+    def __init__(self, size, emaAlpha):
+        self.times = np.zeros(size, np.int64)  # nanoseconds
+        self.index = 0
+        self.count = 0
+        self.total = 0  # sum of the window, kept exact with integer nanoseconds
+        self.ema = 0.0
+        self.emaAlpha = emaAlpha
+
+    def add(self, duration):
+        self.total += duration - int(self.times[self.index])
+        self.times[self.index] = duration
+        self.index = (self.index + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+        self.ema = duration if self.count == 1 else self.ema + self.emaAlpha * (duration - self.ema)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def values(self):
+        """
+        :return: Durations in the window in nanoseconds, oldest first
+        """
+        if self.count < len(self.times):
+            return self.times[:self.count].copy()
+        return np.roll(self.times, -self.index)
+
+    def getStats(self):
+        """
+        :return: dict with count, and mean, ema, p50, p95, p99 and jitter (standard deviation) in ms
+        """
+        if self.count == 0:
+            return {"count": 0, "mean": 0.0, "ema": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "jitter": 0.0}
+        times = self.times[:self.count] / 1e6
+        p50, p95, p99 = np.percentile(times, (50, 95, 99)).tolist()
+        return {"count": self.count, "mean": self.mean / 1e6, "ema": self.ema / 1e6,
+                "p50": p50, "p95": p95, "p99": p99, "jitter": float(times.std())}
+
+
 class FPS:
     """
     FPS class for calculating and displaying the Frames Per Second in a video stream.
+    Frame times are measured with time.perf_counter_ns and kept in a fixed ring buffer,
+    so every update is O(1). Named sub-timers measure the stages of the loop, e.g.
+    capture, inference and drawing, with the same statistics.
 
     Attributes:
-        pTime (float): Previous time stamp.
-        frameTimes (list): List to keep track of frame times.
+        pTime (float): Previous time stamp in seconds, from time.perf_counter.
+        frameTimes (list): The last frame times in seconds, oldest first.
+        frameWindow (_TimingWindow): Ring buffer of the last frame times in nanoseconds.
         avgCount (int): Number of frames over which to average the FPS.
     """
 
-    def __init__(self, avgCount=30):
+    def __init__(self, avgCount=30, emaAlpha=0.1):
         """
         Initialize FPS class.
 
-        :param avgCount: Number of frames over which to average the FPS, default is 30.
+        :param avgCount: Number of frames over which to average the FPS and compute percentiles, default is 30.
+        :param emaAlpha: Weight of the newest frame in the exponential moving average, between 0 and 1.
         """
-        self.pTime = time.time()  # Initialize previous time to current time
-        self.frameTimes = []  # List to store the time taken for each frame
+        self._pTimeNs = time.perf_counter_ns()  # Initialize previous time to current time
         self.avgCount = avgCount  # Number of frames to average over
+        self.emaAlpha = emaAlpha
+        self.frameWindow = _TimingWindow(avgCount, emaAlpha)  # Time taken for each frame
+        self.timers = {}  # Sub-timer windows by name
+        self.startTimes = {}  # Start time of the running sub-timers
+
+    @property
+    def pTime(self):
+        """Previous time stamp in seconds, on the time.perf_counter clock."""
+        return self._pTimeNs / 1e9
+
+    @pTime.setter
+    def pTime(self, value):
+        self._pTimeNs = int(value * 1e9)
+
+    @property
+    def frameTimes(self):
+        """The last frame times in seconds, oldest first."""
+        return (self.frameWindow.values() / 1e9).tolist()
 
     def update(self, img=None, pos=(20, 50), bgColor=(255, 0, 255),
                textColor=(255, 255, 255), scale=3, thickness=3):
@@ -43,17 +114,12 @@ class FPS:
         :return: FPS value, and optionally the image with FPS drawn on it.
         """
 
-        cTime = time.time()  # Get the current time
-        frameTime = cTime - self.pTime  # Calculate the time difference between the current and previous frame
-        self.frameTimes.append(frameTime)  # Append the time difference to the list
-        self.pTime = cTime  # Update previous time
-
-        # Remove the oldest frame time if the list grows beyond avgCount
-        if len(self.frameTimes) > self.avgCount:
-            self.frameTimes.pop(0)
+        cTime = time.perf_counter_ns()  # Get the current time
+        self.frameWindow.add(cTime - self._pTimeNs)  # Store the time difference between the current and previous frame
+        self._pTimeNs = cTime  # Update previous time
 
-        avgFrameTime = sum(self.frameTimes) / len(self.frameTimes)  # Calculate the average frame time
-        fps = 1 / avgFrameTime  # Calculate FPS based on the average frame time
+        avgFrameTime = self.frameWindow.mean  # Average frame time of the window, kept up to date in O(1)
+        fps = 1e9 / avgFrameTime if avgFrameTime > 0 else 0.0  # Calculate FPS based on the average frame time
 
         # Draw FPS on image if img is provided
         if img is not None:
@@ -62,6 +128,52 @@ class FPS:
                                colorR=bgColor, offset=10)
         return fps, img
 
+    def start(self, name):
+        """
+        Start a named sub-timer.
+
+        :param name: Name of the stage, e.g. "inference"
+        """
+        self.startTimes[name] = time.perf_counter_ns()
+
+    def stop(self, name):
+        """
+        Stop a named sub-timer and record its duration.
+
+        :param name: Name of the stage given to start
+        :return: Duration in ms
+        """
+        duration = time.perf_counter_ns() - self.startTimes.pop(name)
+        if name not in self.timers:
+            self.timers[name] = _TimingWindow(self.avgCount, self.emaAlpha)
+        self.timers[name].add(duration)
+        return duration / 1e6
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Time the code of a with block as a named sub-timer.
+
+        :param name: Name of the stage, e.g. "inference"
+        """
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    def getStats(self):
+        """
+        Frame time statistics of the window, computed on demand.
+
+        :return: dict with fps and emaFps, the frame time mean, ema, p50, p95, p99 and jitter in ms,
+                 and the same statistics for every sub-timer under "timers"
+        """
+        stats = self.frameWindow.getStats()
+        stats["fps"] = 1000 / stats["mean"] if stats["mean"] > 0 else 0.0
+        stats["emaFps"] = 1000 / stats["ema"] if stats["ema"] > 0 else 0.0
+        stats["timers"] = {name: window.getStats() for name, window in self.timers.items()}
+        return stats
 
 
 if __name__ == "__main__":
@@ -74,8 +186,9 @@ if __name__ == "__main__":
 
     # Main loop to capture frames and display FPS
     while True:
-        # Read a frame from the webcam
-        success, img = cap.read()
+        # Read a frame from the webcam, timed as the "capture" stage
+        with fpsReader.timer("capture"):
+            success, img = cap.read()
 
         # Update the FPS counter and draw the FPS on the image
         # fpsReader.update returns the current FPS and the updated image
@@ -83,6 +196,11 @@ if __name__ == "__main__":
                                     bgColor=(255, 0, 255), textColor=(255, 255, 255),
                                     scale=3, thickness=3)
 
+        # Frame time percentiles and the capture stage, computed only when asked for
+        stats = fpsReader.getStats()
+        print(f'p50: {stats["p50"]:.1f} ms  p99: {stats["p99"]:.1f} ms  jitter: {stats["jitter"]:.1f} ms  '
+              f'capture: {stats["timers"]["capture"]["mean"]:.1f} ms')
+
         # Display the image with the FPS counter
         cv2.imshow("Image", img)
 
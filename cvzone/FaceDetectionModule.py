@@ -8,6 +8,8 @@ import cv2
 import mediapipe as mp
 
 import cvzone
+from cvzone.ProfilerModule import callTimer
+from cvzone.Utils import toRGB
 
 
 class FaceDetector:
@@ -34,17 +36,21 @@ class FaceDetector:
         self.faceDetection = self.mpFaceDetection.FaceDetection(min_detection_confidence=self.minDetectionCon,
                                                                 model_selection=self.modelSelection)
 
-    def findFaces(self, img, draw=True):
+    def findFaces(self, img, draw=True, rgb=None):
         """
         Find faces in an image and return the bbox info
         :param img: Image to find the faces in.
         :param draw: Flag to draw the output on the image.
+        :param rgb: RGB version of img, e.g. SharedFrame.rgb, so several detectors convert the frame only once
         :return: Image with or without drawings.
                  Bounding Box list.
         """
 
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        timer = callTimer("findFaces")
+        imgRGB = toRGB(img, rgb)
+        timer.lap("convert")
         self.results = self.faceDetection.process(imgRGB)
+        timer.lap("process")
         bboxs = []
         if self.results.detections:
             for id, detection in enumerate(self.results.detections):
@@ -57,12 +63,17 @@ class FaceDetector:
                              bbox[1] + (bbox[3] // 2)
                     bboxInfo = {"id": id, "bbox": bbox, "score": detection.score, "center": (cx, cy)}
                     bboxs.append(bboxInfo)
-                    if draw:
-                        img = cv2.rectangle(img, bbox, (255, 0, 255), 2)
-
-                        cv2.putText(img, f'{int(detection.score[0] * 100)}%',
-                                    (bbox[0], bbox[1] - 20), cv2.FONT_HERSHEY_PLAIN,
-                                    2, (255, 0, 255), 2)
+            timer.lap("landmarks")
+            if draw:
+                for bboxInfo in bboxs:
+                    bbox = bboxInfo["bbox"]
+                    img = cv2.rectangle(img, bbox, (255, 0, 255), 2)
+
+                    cv2.putText(img, f'{int(bboxInfo["score"][0] * 100)}%',
+                                (bbox[0], bbox[1] - 20), cv2.FONT_HERSHEY_PLAIN,
+                                2, (255, 0, 255), 2)
+                timer.lap("draw")
+        timer.end()
         return img, bboxs
 
 
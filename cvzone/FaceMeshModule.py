@@ -7,6 +7,11 @@ Website: https://www.computervision.zone/
 import cv2
 import mediapipe as mp
 import math
+import numpy as np
+
+from cvzone.LandmarkModule import landmarksToArray
+from cvzone.ProfilerModule import callTimer
+from cvzone.Utils import toRGB
 
 
 class FaceMeshDetector:
@@ -15,49 +20,97 @@ class FaceMeshDetector:
     Helps acquire the landmark points in pixel format
     """
 
-    def __init__(self, staticMode=False, maxFaces=2, minDetectionCon=0.5, minTrackCon=0.5):
+    def __init__(self, staticMode=False, maxFaces=2, minDetectionCon=0.5, minTrackCon=0.5, refineLandmarks=False):
         """
         :param staticMode: In static mode, detection is done on each image: slower
         :param maxFaces: Maximum number of faces to detect
         :param minDetectionCon: Minimum Detection Confidence Threshold
         :param minTrackCon: Minimum Tracking Confidence Threshold
+        :param refineLandmarks: Adds 10 iris landmarks (478 in total), needed for the iris index sets
         """
         self.staticMode = staticMode
         self.maxFaces = maxFaces
         self.minDetectionCon = minDetectionCon
         self.minTrackCon = minTrackCon
+        self.refineLandmarks = refineLandmarks
 
         self.mpDraw = mp.solutions.drawing_utils
         self.mpFaceMesh = mp.solutions.face_mesh
         self.faceMesh = self.mpFaceMesh.FaceMesh(static_image_mode=self.staticMode,
                                                  max_num_faces=self.maxFaces,
+                                                 refine_landmarks=self.refineLandmarks,
                                                  min_detection_confidence=self.minDetectionCon,
                                                  min_tracking_confidence=self.minTrackCon)
         self.drawSpec = self.mpDraw.DrawingSpec(thickness=1, circle_radius=2)
 
-    def findFaceMesh(self, img, draw=True):
+        # Reused by findFaceMesh(asArray=True)
+        self.numLandmarks = 478 if self.refineLandmarks else 468
+        self.lmBuffer = np.zeros((self.maxFaces, self.numLandmarks, 3), np.int32)
+
+        # Landmark indices of each face region, to select them from the array output
+        regions = {"leftEye": self.mpFaceMesh.FACEMESH_LEFT_EYE,
+                   "rightEye": self.mpFaceMesh.FACEMESH_RIGHT_EYE,
+                   "leftEyebrow": self.mpFaceMesh.FACEMESH_LEFT_EYEBROW,
+                   "rightEyebrow": self.mpFaceMesh.FACEMESH_RIGHT_EYEBROW,
+                   "lips": self.mpFaceMesh.FACEMESH_LIPS,
+                   "faceOval": self.mpFaceMesh.FACEMESH_FACE_OVAL}
+        if self.refineLandmarks:
+            regions["leftIris"] = self.mpFaceMesh.FACEMESH_LEFT_IRIS
+            regions["rightIris"] = self.mpFaceMesh.FACEMESH_RIGHT_IRIS
+        self.indexSets = {name: np.unique(np.array(list(edges))) for name, edges in regions.items()}
+
+    def findFaceMesh(self, img, draw=True, asArray=False, rgb=None, roi=None):
         """
         Finds face landmarks in BGR Image.
         :param img: Image to find the face landmarks in.
         :param draw: Flag to draw the output on the image.
+        :param asArray: Return the landmarks as an int32 array of shape (nFaces, numLandmarks, 3)
+                        instead of lists of [x, y]. The array is a view of a buffer that is
+                        reused by the next call, copy it to keep it.
+        :param rgb: RGB version of img, e.g. SharedFrame.rgb, so several detectors convert the frame only once
+        :param roi: Only process this region (x1, y1, x2, y2) of img. The landmarks are still in img coordinates.
         :return: Image with or without drawings
         """
-        self.imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        timer = callTimer("findFaceMesh")
+        imgIn, rgbIn = img, rgb
+        if roi is not None:
+            x1, y1, x2, y2 = roi
+            imgIn = img[y1:y2, x1:x2]
+            rgbIn = None if rgb is None else rgb[y1:y2, x1:x2]
+        self.imgRGB = toRGB(imgIn, rgbIn)
+        timer.lap("convert")
         self.results = self.faceMesh.process(self.imgRGB)
-        faces = []
-        if self.results.multi_face_landmarks:
-            for faceLms in self.results.multi_face_landmarks:
-                if draw:
-                    self.mpDraw.draw_landmarks(img, faceLms, self.mpFaceMesh.FACEMESH_CONTOURS,
-                                               self.drawSpec, self.drawSpec)
-                face = []
-                for id, lm in enumerate(faceLms.landmark):
-                    ih, iw, ic = img.shape
-                    x, y = int(lm.x * iw), int(lm.y * ih)
-                    face.append([x, y])
-                faces.append(face)
+        timer.lap("process")
+        ih, iw, ic = imgIn.shape
+        multiFaceLms = self.results.multi_face_landmarks or []
+        if draw:
+            for faceLms in multiFaceLms:
+                # Landmarks are relative to the processed region, imgIn is a view of img
+                self.mpDraw.draw_landmarks(imgIn, faceLms, self.mpFaceMesh.FACEMESH_CONTOURS,
+                                           self.drawSpec, self.drawSpec)
+            timer.lap("draw")
+
+        lmArray = landmarksToArray(multiFaceLms, iw, ih, out=self.lmBuffer)
+        if roi is not None:
+            lmArray += (roi[0], roi[1], 0)
+        timer.lap("landmarks")
+        if asArray:
+            timer.end()
+            return img, lmArray
+        faces = lmArray[:, :, :2].tolist()
+        timer.lap("output")
+        timer.end()
         return img, faces
 
+    def getRegion(self, lmArray, name):
+        """
+        Select the landmarks of one face region from the array output.
+        :param lmArray: Array from findFaceMesh(asArray=True)
+        :param name: Key of self.indexSets e.g. "leftEye", "lips", "faceOval", "leftIris"
+        :return: Array of shape (nFaces, numRegionLandmarks, 3)
+        """
+        return lmArray[:, self.indexSets[name]]
+
     def findDistance(self,p1, p2, img=None):
         """
         Find the distance between two landmarks based on their
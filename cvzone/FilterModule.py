@@ -0,0 +1,251 @@
+"""
+Filter Module
+Smooths the landmarks of hands, faces and poses with One-Euro, Kalman or EMA filters
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import math
+import time
+
+import cv2
+import numpy as np
+
+
+def matchCenters(centers, trackCenters, maxDistance, labels=None, trackLabels=None):
+    """
+    Greedy nearest center matching of objects to tracks, closest pairs first.
+    :param centers: Centers of the objects (n, 2)
+    :param trackCenters: Centers of the tracks (m, 2)
+    :param maxDistance: Maximum center distance in pixels to match an object to a track
+    :param labels: Optional labels of the objects e.g. the hand types, objects only match tracks with the same label
+    :param trackLabels: Labels of the tracks
+    :return: Track index for every object, -1 if unmatched
+    """
+    trackIdx = np.full(len(centers), -1, np.int64)
+    if len(centers) == 0 or len(trackCenters) == 0:
+        return trackIdx
+    cost = np.linalg.norm(np.asarray(centers)[:, None, :] - np.asarray(trackCenters)[None, :, :], axis=2)
+    if labels is not None and trackLabels is not None:
+        cost[np.asarray(labels)[:, None] != np.asarray(trackLabels)[None, :]] = np.inf
+    usedTracks = set()
+    for flat in np.argsort(cost, axis=None).tolist():
+        i, j = divmod(flat, cost.shape[1])
+        if cost[i, j] > maxDistance:
+            break
+        if trackIdx[i] < 0 and j not in usedTracks:
+            trackIdx[i] = j
+            usedTracks.add(j)
+    return trackIdx
+
+
+class LandmarkFilter:
+    """
+    Filter bank that smooths every landmark of every tracked object.
+    The state of all landmarks is kept in contiguous NumPy arrays of shape
+    (numTracks, numLandmarks, D) and updated in one vectorized step per frame.
+    Objects are matched to the previous frame by the distance between their
+    centers, so the filter state follows the right hand or face.
+
+    Methods:
+        "oneEuro": One-Euro filter, little lag on fast motion and strong smoothing when still
+        "kalman": Constant velocity Kalman filter on each coordinate
+        "ema": Exponential moving average
+    """
+
+    def __init__(self, method="oneEuro", minCutoff=1.0, beta=0.01, dCutoff=1.0, alpha=0.5,
+                 processNoise=1000.0, measurementNoise=4.0, maxDistance=100, maxAge=5):
+        """
+        :param method: "oneEuro", "kalman" or "ema"
+        :param minCutoff: One-Euro minimum cutoff frequency in Hz, lower = smoother when still
+        :param beta: One-Euro speed coefficient, higher = less lag when moving fast
+        :param dCutoff: One-Euro cutoff frequency for the speed in Hz
+        :param alpha: EMA weight of the new value, between 0 and 1
+        :param processNoise: Kalman acceleration noise, higher = follows motion faster
+        :param measurementNoise: Kalman measurement noise in pixels squared, higher = smoother
+        :param maxDistance: Maximum center distance in pixels to match an object to a track
+        :param maxAge: Number of frames a track is kept without a match
+        """
+        if method not in ("oneEuro", "kalman", "ema"):
+            raise ValueError('method must be "oneEuro", "kalman" or "ema"')
+        self.method = method
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.dCutoff = dCutoff
+        self.alpha = alpha
+        self.processNoise = processNoise
+        self.measurementNoise = measurementNoise
+        self.maxDistance = maxDistance
+        self.maxAge = maxAge
+        self.reset()
+
+    def reset(self):
+        """Forget all tracks."""
+        self.ids = np.zeros(0, np.int64)
+        self.age = np.zeros(0, np.int64)
+        self.lastTime = np.zeros(0, np.float64)
+        self.x = None  # filtered values
+        self.v = None  # speed (One-Euro, Kalman)
+        self.p00 = self.p01 = self.p11 = None  # Kalman covariance of each coordinate
+        self.nextId = 0
+
+    def update(self, lmArray, t=None, ids=None):
+        """
+        Filter the landmarks of the current frame.
+        :param lmArray: Landmarks of shape (nObjects, numLandmarks, D), e.g. the array output of a detector
+        :param t: Timestamp in seconds, time.perf_counter() if None
+        :param ids: Optional track ids of the objects (e.g. from an ObjectTracker).
+                    If None, objects are matched to the tracks of the previous frame.
+        :return: Filtered landmarks of shape (nObjects, numLandmarks, D) in the input order, and their track ids
+        """
+        t = time.perf_counter() if t is None else t
+        z = np.asarray(lmArray, dtype=np.float64)
+        n = len(z)
+        if self.x is not None and n and self.x.shape[1:] != z.shape[1:]:
+            self.reset()
+
+        if ids is None:
+            trackIdx = self._match(z)
+        else:
+            position = {trackId: i for i, trackId in enumerate(self.ids.tolist())}
+            trackIdx = np.array([position.get(trackId, -1) for trackId in np.asarray(ids).tolist()], np.int64)
+
+        matched = trackIdx >= 0
+        rows = trackIdx[matched]
+        out = np.empty_like(z)
+
+        # Update all matched objects in one vectorized step
+        if len(rows):
+            dt = np.maximum(t - self.lastTime[rows], 1e-6)[:, None, None]
+            out[matched] = self._step(rows, z[matched], dt)
+
+        # Unmatched objects start new tracks
+        new = ~matched
+        numNew = int(new.sum())
+        if ids is None:
+            newIds = np.arange(self.nextId, self.nextId + numNew)
+            self.nextId += numNew
+        else:
+            newIds = np.asarray(ids)[new]
+            self.nextId = max(self.nextId, int(newIds.max()) + 1) if numNew else self.nextId
+        out[new] = z[new]
+        self._append(z[new], newIds, t)
+
+        outIds = np.empty(n, np.int64)
+        outIds[matched] = self.ids[rows]
+        outIds[new] = newIds
+
+        # Age the tracks that were not seen and drop the old ones
+        seen = np.zeros(len(self.ids), bool)
+        seen[rows] = True
+        seen[len(self.ids) - numNew:] = True
+        self.age[seen] = 0
+        self.age[~seen] += 1
+        self.lastTime[seen] = t
+        self._keep(self.age <= self.maxAge)
+        return out, outIds
+
+    def _match(self, z):
+        """
+        Greedy nearest center matching of the objects to the existing tracks.
+        :return: Track row for every object, -1 if unmatched
+        """
+        if self.x is None or len(self.ids) == 0 or len(z) == 0:
+            return np.full(len(z), -1, np.int64)
+        return matchCenters(z[:, :, :2].mean(axis=1), self.x[:, :, :2].mean(axis=1), self.maxDistance)
+
+    def _step(self, rows, z, dt):
+        if self.method == "ema":
+            x = self.alpha * z + (1 - self.alpha) * self.x[rows]
+            self.x[rows] = x
+            return x
+
+        if self.method == "oneEuro":
+            xPrev, dxPrev = self.x[rows], self.v[rows]
+            aD = _smoothingFactor(self.dCutoff, dt)
+            dx = aD * ((z - xPrev) / dt) + (1 - aD) * dxPrev
+            cutoff = self.minCutoff + self.beta * np.abs(dx)
+            a = _smoothingFactor(cutoff, dt)
+            x = a * z + (1 - a) * xPrev
+            self.x[rows], self.v[rows] = x, dx
+            return x
+
+        # Kalman: predict with constant velocity
+        q, r = self.processNoise, self.measurementNoise
+        p, v = self.x[rows], self.v[rows]
+        p00, p01, p11 = self.p00[rows], self.p01[rows], self.p11[rows]
+        p = p + v * dt
+        p00 = p00 + 2 * dt * p01 + dt * dt * p11 + q * dt ** 3 / 3
+        p01 = p01 + dt * p11 + q * dt ** 2 / 2
+        p11 = p11 + q * dt
+
+        # Update with the measurement
+        s = p00 + r
+        k0, k1 = p00 / s, p01 / s
+        y = z - p
+        p = p + k0 * y
+        v = v + k1 * y
+        p11 = p11 - k1 * p01
+        p00, p01 = (1 - k0) * p00, (1 - k0) * p01
+
+        self.x[rows], self.v[rows] = p, v
+        self.p00[rows], self.p01[rows], self.p11[rows] = p00, p01, p11
+        return p
+
+    def _append(self, z, newIds, t):
+        n = len(z)
+        if self.x is None:
+            empty = np.zeros((0,) + z.shape[1:])
+            self.x, self.v = empty, empty.copy()
+            self.p00, self.p01, self.p11 = empty.copy(), empty.copy(), empty.copy()
+        if n == 0:
+            return
+        zeros = np.zeros_like(z)
+        self.x = np.concatenate((self.x, z))
+        self.v = np.concatenate((self.v, zeros))
+        self.p00 = np.concatenate((self.p00, np.full_like(z, self.measurementNoise)))
+        self.p01 = np.concatenate((self.p01, zeros))
+        self.p11 = np.concatenate((self.p11, np.full_like(z, self.processNoise)))
+        self.ids = np.concatenate((self.ids, newIds.astype(np.int64)))
+        self.age = np.concatenate((self.age, np.zeros(n, np.int64)))
+        self.lastTime = np.concatenate((self.lastTime, np.full(n, t)))
+
+    def _keep(self, keep):
+        if keep.all():
+            return
+        self.ids, self.age, self.lastTime = self.ids[keep], self.age[keep], self.lastTime[keep]
+        self.x, self.v = self.x[keep], self.v[keep]
+        self.p00, self.p01, self.p11 = self.p00[keep], self.p01[keep], self.p11[keep]
+
+
+def _smoothingFactor(cutoff, dt):
+    r = 2 * math.pi * cutoff * dt
+    return r / (r + 1)
+
+
+def main():
+    from cvzone.HandTrackingModule import HandDetector
+
+    cap = cv2.VideoCapture(0)
+    detector = HandDetector(staticMode=False, maxHands=2)
+    handFilter = LandmarkFilter(method="oneEuro", minCutoff=1.0, beta=0.01)
+
+    while True:
+        success, img = cap.read()
+        hands, img = detector.findHands(img, draw=False, asArray=True)
+
+        # Smooth all 21 landmarks of every hand in one step, the ids follow each hand
+        smoothed, ids = handFilter.update(hands["lmList"])
+        for lmArray, handId in zip(smoothed.astype(int), ids):
+            for x, y, z in lmArray.tolist():
+                cv2.circle(img, (x, y), 4, (255, 0, 255), cv2.FILLED)
+            cv2.putText(img, f'ID {handId}', tuple(lmArray[0, :2].tolist()), cv2.FONT_HERSHEY_PLAIN,
+                        2, (255, 0, 255), 2)
+
+        cv2.imshow("Image", img)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Frame Skip Module
+Runs a detector only on some frames and predicts the landmarks in between
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import cv2
+import numpy as np
+
+from cvzone.FilterModule import matchCenters
+from cvzone.LandmarkModule import boundingBoxes
+
+
+class FrameSkipper:
+    """
+    Wraps a HandDetector, FaceMeshDetector or PoseDetector and runs real
+    inference only every few frames. In between, the landmarks are predicted
+    with a constant velocity model from the last two detections and returned
+    in the same structure as the wrapped method. The interval can be fixed or
+    adapt to how fast the landmarks move. MediaPipe can return the hands or
+    faces in a different order on every detection, so each object is matched
+    to the previous detection by its center (and hand type) before its
+    velocity is computed.
+    """
+
+    def __init__(self, detector, every=2, adaptive=False, motionThreshold=4, maxSkip=5, maxDistance=100):
+        """
+        :param detector: HandDetector, FaceMeshDetector or PoseDetector
+        :param every: Run inference on one frame out of every
+        :param adaptive: Choose the interval from the landmark motion instead of using every
+        :param motionThreshold: In adaptive mode, landmarks may move about this many pixels
+                                between inferences. Faster motion means inference on more frames.
+        :param maxSkip: In adaptive mode, the largest interval between inferences
+        :param maxDistance: Maximum center distance in pixels to match an object to the previous detection.
+                            Objects without a match are held still until the next inference.
+        """
+        self.detector = detector
+        self.every = every
+        self.adaptive = adaptive
+        self.motionThreshold = motionThreshold
+        self.maxSkip = maxSkip
+        self.maxDistance = maxDistance
+
+        if hasattr(detector, "findHands"):
+            self.kind = "hands"
+        elif hasattr(detector, "findFaceMesh"):
+            self.kind = "faceMesh"
+        elif hasattr(detector, "findPosition"):
+            self.kind = "pose"
+        else:
+            raise ValueError("detector must be a HandDetector, FaceMeshDetector or PoseDetector")
+
+        self.frameCount = 0
+        self.inferenceCount = 0
+        self.interval = every
+        self.lastInference = -1
+        self.history = []  # (frame, lmArray) of the last two detections
+        self.labels = None  # hand types of the last detection
+        self.velocity = None  # per frame motion of the last detection's landmarks, in its order
+        self.meta = None
+        self.errorSum = 0.0
+        self.errorCount = 0
+
+    def find(self, img, **kwargs):
+        """
+        Find the landmarks, running the detector only when needed.
+        Takes the keyword arguments of findHands, findFaceMesh or findPosition
+        and returns the same output as that method. For a PoseDetector findPose is called first.
+        :param img: Image to find the landmarks in
+        """
+        frame = self.frameCount
+        self.frameCount += 1
+
+        if self.lastInference < 0 or frame - self.lastInference >= self.interval:
+            output = self._detect(img, kwargs)
+            lmArray, self.meta = self._toArray(output)
+            labels = list(self.meta[1]) if self.kind == "hands" else None
+            predicted = self._predict(frame)
+            match = self._match(lmArray, labels)
+            matched = match >= 0
+            if matched.any():
+                error = np.linalg.norm(predicted[match[matched], :, :2] - lmArray[matched, :, :2], axis=-1).mean()
+                self.errorSum += error
+                self.errorCount += 1
+            self.velocity = np.zeros_like(lmArray)
+            if matched.any():
+                f0, a0 = self.history[-1]
+                self.velocity[matched] = (lmArray[matched] - a0[match[matched]]) / (frame - f0)
+            self.history = (self.history + [(frame, lmArray)])[-2:]
+            self.labels = labels
+            self.lastInference = frame
+            self.inferenceCount += 1
+            if self.adaptive:
+                self.interval = self._adaptiveInterval(matched)
+            return output
+
+        lmArray = self._predict(frame)
+        if lmArray is None:
+            lmArray = self.history[-1][1]
+        if kwargs.get("draw", True):
+            for x, y in lmArray[..., :2].reshape(-1, 2).astype(np.int32).tolist():
+                cv2.circle(img, (x, y), 2, (255, 0, 255), cv2.FILLED)
+        return self._fromArray(lmArray, img, kwargs)
+
+    def _detect(self, img, kwargs):
+        if self.kind == "hands":
+            return self.detector.findHands(img, **kwargs)
+        if self.kind == "faceMesh":
+            return self.detector.findFaceMesh(img, **kwargs)
+        self.detector.findPose(img, draw=kwargs.get("draw", True))
+        return self.detector.findPosition(img, **kwargs)
+
+    def _match(self, lmArray, labels):
+        """
+        Index of every detected object in the previous detection, -1 if it has no match.
+        """
+        if not self.history or len(lmArray) == 0 or self.history[-1][1].shape[1:] != lmArray.shape[1:]:
+            return np.full(len(lmArray), -1, np.int64)
+        previous = self.history[-1][1]
+        return matchCenters(lmArray[..., :2].mean(axis=1), previous[..., :2].mean(axis=1), self.maxDistance,
+                            labels, self.labels)
+
+    def _predict(self, frame):
+        """
+        Constant velocity prediction of the landmarks for a frame, None if there is no history.
+        """
+        if not self.history:
+            return None
+        f1, a1 = self.history[-1]
+        predicted = a1 + self.velocity * (frame - f1)
+        if predicted.shape[-1] == 4:
+            # Visibility is not extrapolated
+            predicted[..., 3] = a1[..., 3]
+        return predicted
+
+    def _adaptiveInterval(self, matched):
+        # The motion of objects without a match in the previous detection is unknown
+        if not matched.any():
+            return 1
+        motion = np.linalg.norm(self.velocity[matched, :, :2], axis=-1).max()
+        if motion <= 0:
+            return self.maxSkip
+        return int(np.clip(self.motionThreshold // motion, 1, self.maxSkip))
+
+    def _toArray(self, output):
+        """
+        Landmarks of the wrapped method's output as a float array (n, numLandmarks, D),
+        plus what is needed to rebuild the output.
+        """
+        if self.kind == "hands":
+            hands = output[0]
+            if isinstance(hands, dict):
+                return hands["lmList"].astype(np.float64), ("array", hands["type"].copy())
+            lmArray = np.array([hand["lmList"] for hand in hands], np.float64).reshape(len(hands), 21, 3)
+            return lmArray, ("list", [hand["type"] for hand in hands])
+        if self.kind == "faceMesh":
+            faces = output[1]
+            if isinstance(faces, np.ndarray):
+                return faces.astype(np.float64), ("array", None)
+            return np.array(faces, np.float64).reshape(len(faces), -1, 2) if faces else np.zeros((0, 0, 2)), \
+                ("list", None)
+        lmList, bboxInfo = output
+        if isinstance(lmList, np.ndarray):
+            return lmList.astype(np.float64).reshape(-1, 33, 4), ("array", dict(bboxInfo))
+        return np.array(lmList, np.float64).reshape(-1, 33, 3), ("list", dict(bboxInfo))
+
+    def _fromArray(self, lmArray, img, kwargs):
+        """
+        Rebuild the wrapped method's output from predicted landmarks.
+        """
+        mode, info = self.meta
+        if self.kind == "hands":
+            lmInt = lmArray.astype(np.int32)
+            bboxes, centers = boundingBoxes(lmInt)
+            if mode == "array":
+                return {"lmList": lmInt, "bbox": bboxes, "center": centers, "type": info}, img
+            hands = [{"lmList": lm, "bbox": tuple(bbox), "center": tuple(center), "type": handType}
+                     for lm, bbox, center, handType in zip(lmInt.tolist(), bboxes.tolist(),
+                                                           centers.tolist(), info)]
+            return hands, img
+        if self.kind == "faceMesh":
+            lmInt = lmArray.astype(np.int32)
+            return img, (lmInt if mode == "array" else lmInt.tolist())
+
+        if len(lmArray) == 0:
+            return (np.zeros((0, 4), np.float32) if mode == "array" else []), {}
+        # Move the last detected bounding box with the landmarks
+        bboxInfo = info
+        if bboxInfo:
+            shift = (lmArray[0, :, :2] - self.history[-1][1][0, :, :2]).mean(axis=0).astype(int).tolist()
+            x, y, w, h = bboxInfo["bbox"]
+            cx, cy = bboxInfo["center"]
+            bboxInfo = {"bbox": (x + shift[0], y + shift[1], w, h),
+                        "center": (cx + shift[0], cy + shift[1])}
+        if mode == "array":
+            return lmArray[0].astype(np.float32), bboxInfo
+        return lmArray[0].astype(np.int32).tolist(), bboxInfo
+
+    @property
+    def inferenceRate(self):
+        """Fraction of frames on which the detector actually ran."""
+        return self.inferenceCount / self.frameCount if self.frameCount else 0.0
+
+    @property
+    def predictionError(self):
+        """Mean distance in pixels between the predicted and detected landmarks on inference frames."""
+        return self.errorSum / self.errorCount if self.errorCount else 0.0
+
+
+def main():
+    from cvzone.HandTrackingModule import HandDetector
+
+    cap = cv2.VideoCapture(0)
+    detector = HandDetector(staticMode=False, maxHands=2)
+
+    # Run the hand model on at most every frame and at least every 4th frame, depending on motion
+    skipper = FrameSkipper(detector, adaptive=True, motionThreshold=6, maxSkip=4)
+
+    while True:
+        success, img = cap.read()
+        hands, img = skipper.find(img, draw=True, flipType=True)
+
+        print(f'inference rate: {skipper.inferenceRate:.2f}  prediction error: {skipper.predictionError:.1f} px')
+        cv2.imshow("Image", img)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+
+if __name__ == "__main__":
+    main()
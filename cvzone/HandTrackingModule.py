@@ -8,6 +8,11 @@ import math
 
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from cvzone.LandmarkModule import landmarksToArray, boundingBoxes, fingerStates
+from cvzone.ProfilerModule import callTimer
+from cvzone.Utils import toRGB
 
 
 class HandDetector:
@@ -18,7 +23,8 @@ class HandDetector:
     provides bounding box info of the hand found.
     """
 
-    def __init__(self, staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5):
+    def __init__(self, staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5,
+                 roiTracking=False, roiMargin=0.5, roiRefresh=30):
 
         """
         :param mode: In static mode, detection is done on each image: slower
@@ -26,6 +32,10 @@ class HandDetector:
         :param modelComplexity: Complexity of the hand landmark model: 0 or 1.
         :param detectionCon: Minimum Detection Confidence Threshold
         :param minTrackCon: Minimum Tracking Confidence Threshold
+        :param roiTracking: Only process a crop around the hands of the previous frame.
+                            Falls back to the full frame when no hand is found in the crop.
+        :param roiMargin: Margin added around the previous hands, as a fraction of their size
+        :param roiRefresh: Process the full frame every roiRefresh frames to pick up new hands
         """
         self.staticMode = staticMode
         self.maxHands = maxHands
@@ -44,61 +54,109 @@ class HandDetector:
         self.fingers = []
         self.lmList = []
 
-    def findHands(self, img, draw=True, flipType=True):
+        self.roiTracking = roiTracking
+        self.roiMargin = roiMargin
+        self.roiRefresh = roiRefresh
+        self.roi = None
+        self.prevBboxes = None
+        self.roiCount = 0
+
+    def _trackingRegion(self, img):
+        """
+        Region around the hands of the previous frame, or None to process the full frame.
+        :return: x1, y1, x2, y2
+        """
+        if self.prevBboxes is None or len(self.prevBboxes) == 0 or self.roiCount >= self.roiRefresh:
+            return None
+        h, w = img.shape[:2]
+        x1, y1 = self.prevBboxes[:, :2].min(axis=0)
+        x2, y2 = (self.prevBboxes[:, :2] + self.prevBboxes[:, 2:]).max(axis=0)
+        margin = int(max(x2 - x1, y2 - y1) * self.roiMargin)
+        x1, y1 = max(int(x1) - margin, 0), max(int(y1) - margin, 0)
+        x2, y2 = min(int(x2) + margin, w), min(int(y2) + margin, h)
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return None
+        return x1, y1, x2, y2
+
+    def findHands(self, img, draw=True, flipType=True, asArray=False, rgb=None, roi=None):
         """
         Finds hands in a BGR image.
         :param img: Image to find the hands in.
         :param draw: Flag to draw the output on the image.
-        :return: Image with or without drawings
+        :param flipType: Flag to swap the Left and Right labels, for mirrored images.
+        :param asArray: Return the hands as NumPy arrays instead of a list of dicts.
+                        The result is a dict with "lmList" (nHands, 21, 3) int32,
+                        "bbox" (nHands, 4) int32, "center" (nHands, 2) int32 and
+                        "type" (nHands,) str arrays, all in the same hand order.
+        :param rgb: RGB version of img, e.g. SharedFrame.rgb, so several detectors convert the frame only once
+        :param roi: Only process this region (x1, y1, x2, y2) of img. The landmarks are still in img coordinates.
+        :return: Hands found and the image with or without drawings
         """
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
-        allHands = []
-        h, w, c = img.shape
-        if self.results.multi_hand_landmarks:
-            for handType, handLms in zip(self.results.multi_handedness, self.results.multi_hand_landmarks):
-                myHand = {}
-                ## lmList
-                mylmList = []
-                xList = []
-                yList = []
-                for id, lm in enumerate(handLms.landmark):
-                    px, py, pz = int(lm.x * w), int(lm.y * h), int(lm.z * w)
-                    mylmList.append([px, py, pz])
-                    xList.append(px)
-                    yList.append(py)
-
-                ## bbox
-                xmin, xmax = min(xList), max(xList)
-                ymin, ymax = min(yList), max(yList)
-                boxW, boxH = xmax - xmin, ymax - ymin
-                bbox = xmin, ymin, boxW, boxH
-                cx, cy = bbox[0] + (bbox[2] // 2), \
-                         bbox[1] + (bbox[3] // 2)
-
-                myHand["lmList"] = mylmList
-                myHand["bbox"] = bbox
-                myHand["center"] = (cx, cy)
-
-                if flipType:
-                    if handType.classification[0].label == "Right":
-                        myHand["type"] = "Left"
-                    else:
-                        myHand["type"] = "Right"
-                else:
-                    myHand["type"] = handType.classification[0].label
-                allHands.append(myHand)
-
-                ## draw
-                if draw:
-                    self.mpDraw.draw_landmarks(img, handLms,
-                                               self.mpHands.HAND_CONNECTIONS)
-                    cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20),
-                                  (bbox[0] + bbox[2] + 20, bbox[1] + bbox[3] + 20),
-                                  (255, 0, 255), 2)
-                    cv2.putText(img, myHand["type"], (bbox[0] - 30, bbox[1] - 30), cv2.FONT_HERSHEY_PLAIN,
-                                2, (255, 0, 255), 2)
+        timer = callTimer("findHands")
+        if roi is not None:
+            self.roi = tuple(roi)
+        else:
+            self.roi = self._trackingRegion(img) if self.roiTracking else None
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            imgIn = img[y1:y2, x1:x2]
+            imgRGB = toRGB(imgIn, None if rgb is None else rgb[y1:y2, x1:x2])
+            timer.lap("convert")
+            self.results = self.hands.process(imgRGB)
+            timer.lap("process")
+            self.roiCount += 1
+            if not self.results.multi_hand_landmarks and roi is None:
+                # Tracking lost, search the full frame
+                self.roi = None
+        if self.roi is None:
+            imgIn = img
+            imgRGB = toRGB(img, rgb)
+            timer.lap("convert")
+            self.results = self.hands.process(imgRGB)
+            timer.lap("process")
+            self.roiCount = 0
+        h, w, c = imgIn.shape
+        multiHandLms = self.results.multi_hand_landmarks or []
+
+        # Convert the landmarks of every hand at once
+        lmArray = landmarksToArray(multiHandLms, w, h).reshape(len(multiHandLms), 21, 3)
+        if self.roi is not None:
+            lmArray += (self.roi[0], self.roi[1], 0)
+        bboxes, centers = boundingBoxes(lmArray)
+        self.prevBboxes = bboxes
+        handTypes = []
+        for handType in self.results.multi_handedness or []:
+            label = handType.classification[0].label
+            if flipType:
+                label = "Left" if label == "Right" else "Right"
+            handTypes.append(label)
+        timer.lap("landmarks")
+
+        if draw:
+            for handLms, bbox, handType in zip(multiHandLms, bboxes.tolist(), handTypes):
+                # Landmarks are relative to the processed region, imgIn is a view of img
+                self.mpDraw.draw_landmarks(imgIn, handLms,
+                                           self.mpHands.HAND_CONNECTIONS)
+                cv2.rectangle(img, (bbox[0] - 20, bbox[1] - 20),
+                              (bbox[0] + bbox[2] + 20, bbox[1] + bbox[3] + 20),
+                              (255, 0, 255), 2)
+                cv2.putText(img, handType, (bbox[0] - 30, bbox[1] - 30), cv2.FONT_HERSHEY_PLAIN,
+                            2, (255, 0, 255), 2)
+            timer.lap("draw")
+
+        if asArray:
+            allHands = {"lmList": lmArray, "bbox": bboxes, "center": centers,
+                        "type": np.array(handTypes, dtype=str)}
+            timer.end()
+            return allHands, img
 
+        allHands = []
+        for lmList, bbox, center, handType in zip(lmArray.tolist(), bboxes.tolist(),
+                                                  centers.tolist(), handTypes):
+            allHands.append({"lmList": lmList, "bbox": tuple(bbox),
+                             "center": tuple(center), "type": handType})
+        timer.lap("output")
+        timer.end()
         return allHands, img
 
     def fingersUp(self, myHand):
@@ -132,6 +190,17 @@ class HandDetector:
                     fingers.append(0)
         return fingers
 
+    def fingersUpArray(self, lmArray, handTypes):
+        """
+        Finds which fingers are open for many hands, or a whole recording, at once.
+        Works on stored landmarks and does not depend on the last processed frame.
+        :param lmArray: Landmarks of shape (nHands, 21, 3) or (nFrames, nHands, 21, 3),
+                        e.g. "lmList" of findHands(asArray=True)
+        :param handTypes: "Left"/"Right" labels with shape (nHands,) or (nFrames, nHands)
+        :return: Boolean array of shape (..., 5) with the state of each finger
+        """
+        return fingerStates(lmArray, handTypes, self.tipIds)
+
     def findDistance(self, p1, p2, img=None, color=(255, 0, 255), scale=5):
         """
         Find the distance between two landmarks input should be (x1,y1) (x2,y2)
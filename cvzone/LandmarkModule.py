@@ -0,0 +1,161 @@
+"""
+Landmark Module
+Vectorized helpers for working with mediapipe landmarks as NumPy arrays
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import cv2
+import numpy as np
+
+
+def landmarksToArray(multiLandmarks, w, h, dtype=np.int32, out=None, visibility=False):
+    """
+    Convert mediapipe landmark lists to pixel coordinates in one NumPy expression.
+    z is scaled by the image width, the same as the list outputs of the detectors.
+
+    :param multiLandmarks: List of mediapipe NormalizedLandmarkList, one per object
+    :param w: Image width
+    :param h: Image height
+    :param dtype: dtype of the result, np.int32 truncates like int(), np.float32 keeps sub pixel values
+    :param out: Optional preallocated array of shape (maxObjects, numLandmarks, 3) to fill
+    :param visibility: Add the landmark visibility (0 to 1, not scaled) as a 4th column
+    :return: Array of shape (numObjects, numLandmarks, 3 or 4). A view of out if it was given.
+    """
+    n = len(multiLandmarks)
+    cols = 4 if visibility else 3
+    if n == 0:
+        return np.zeros((0, 0, cols), dtype) if out is None else out[:0]
+    # Scaled in float64 so the int32 result matches int(lm.x * w) exactly
+    if visibility:
+        raw = np.array([[(lm.x, lm.y, lm.z, lm.visibility) for lm in lms.landmark] for lms in multiLandmarks],
+                       dtype=np.float64).reshape(n, -1, 4)
+        raw *= (w, h, w, 1)
+    else:
+        raw = np.array([[(lm.x, lm.y, lm.z) for lm in lms.landmark] for lms in multiLandmarks],
+                       dtype=np.float64).reshape(n, -1, 3)
+        raw *= (w, h, w)
+    if out is None:
+        return raw.astype(dtype, copy=False)
+    k = raw.shape[1]
+    np.copyto(out[:n, :k], raw, casting='unsafe')
+    return out[:n, :k]
+
+
+def boundingBoxes(lmArray):
+    """
+    Bounding boxes and centers of landmark arrays.
+
+    :param lmArray: Array of shape (numObjects, numLandmarks, 2 or 3)
+    :return: bboxes (numObjects, 4) as x, y, w, h and centers (numObjects, 2)
+    """
+    mins = lmArray[:, :, :2].min(axis=1)
+    maxs = lmArray[:, :, :2].max(axis=1)
+    bboxes = np.concatenate((mins, maxs - mins), axis=1)
+    if np.issubdtype(lmArray.dtype, np.integer):
+        centers = mins + (maxs - mins) // 2
+    else:
+        centers = mins + (maxs - mins) / 2
+    return bboxes, centers
+
+
+def jointAngles(lmArray, triplets):
+    """
+    Angles at the middle point of many landmark triplets, computed in one call.
+    Gives the same result as PoseDetector.findAngle for each (p1, p2, p3).
+
+    :param lmArray: Landmarks of shape (numLandmarks, 2+) or a time series (..., numLandmarks, 2+)
+    :param triplets: Array of shape (N, 3) with the landmark indices p1, p2, p3 of each angle
+    :return: Angles in degrees in [0, 360), shape (N,) or (..., N)
+    """
+    triplets = np.asarray(triplets)
+    lmArray = np.asarray(lmArray, dtype=np.float64)
+    p1 = lmArray[..., triplets[:, 0], :2]
+    p2 = lmArray[..., triplets[:, 1], :2]
+    p3 = lmArray[..., triplets[:, 2], :2]
+    v1, v3 = p1 - p2, p3 - p2
+    angles = np.degrees(np.arctan2(v3[..., 1], v3[..., 0]) - np.arctan2(v1[..., 1], v1[..., 0]))
+    return angles % 360
+
+
+def landmarkDistances(lmArray, pairs=None, normalize=False):
+    """
+    Distances between many landmarks in one vectorized call, instead of
+    calling findDistance once per pair.
+
+    :param lmArray: Landmarks of shape (numLandmarks, 2+) or (..., numLandmarks, 2+) e.g. (nHands, 21, 3).
+                    Only x and y are used.
+    :param pairs: Array of shape (N, 2) with landmark index pairs. If None the distances
+                  between all pairs are returned as a matrix.
+    :param normalize: If True, divide by the diagonal of each object's bounding box so the
+                      result does not depend on the size of the hand or face. An array of
+                      sizes of shape (...) can also be given.
+    :return: Distances of shape (..., N) for pairs, or (..., numLandmarks, numLandmarks) for all pairs
+    """
+    points = np.asarray(lmArray, dtype=np.float64)[..., :2]
+    if pairs is None:
+        diff = points[..., :, None, :] - points[..., None, :, :]
+    else:
+        pairs = np.asarray(pairs)
+        diff = points[..., pairs[:, 1], :] - points[..., pairs[:, 0], :]
+    distances = np.sqrt(np.einsum('...i,...i->...', diff, diff))
+
+    if normalize is not False and normalize is not None:
+        if normalize is True:
+            extent = points.max(axis=-2) - points.min(axis=-2)
+            size = np.hypot(extent[..., 0], extent[..., 1])
+        else:
+            size = np.asarray(normalize, dtype=np.float64)
+        size = np.where(size > 0, size, 1.0)
+        extraDims = distances.ndim - size.ndim
+        distances = distances / size.reshape(size.shape + (1,) * extraDims)
+    return distances
+
+
+def drawDistances(img, lmArray, pairs, color=(255, 0, 255), scale=5):
+    """
+    Draw the lines measured by landmarkDistances, in the style of findDistance.
+
+    :param img: Image to draw on
+    :param lmArray: Landmarks of one object, shape (numLandmarks, 2+)
+    :param pairs: Array of shape (N, 2) with landmark index pairs
+    :param color: Color of the lines and points
+    :param scale: Radius of the points
+    :return: Image with the output drawn
+    """
+    points = np.asarray(lmArray)[:, :2].astype(np.int32)
+    for i1, i2 in np.asarray(pairs).tolist():
+        x1, y1 = points[i1].tolist()
+        x2, y2 = points[i2].tolist()
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        cv2.circle(img, (x1, y1), scale, color, cv2.FILLED)
+        cv2.circle(img, (x2, y2), scale, color, cv2.FILLED)
+        cv2.line(img, (x1, y1), (x2, y2), color, max(1, scale // 3))
+        cv2.circle(img, (cx, cy), scale, color, cv2.FILLED)
+    return img
+
+
+def fingerStates(lmArray, handTypes, tipIds=(4, 8, 12, 16, 20)):
+    """
+    Which fingers are up for any number of hands and frames, in one call.
+    Uses the same rules as HandDetector.fingersUp but needs no detector results,
+    so recorded landmarks can be scored offline.
+
+    :param lmArray: Hand landmarks of shape (21, 2+), (nHands, 21, 2+) or (nFrames, nHands, 21, 2+)
+    :param handTypes: "Left"/"Right" labels (or True for right hands) with the leading shape of lmArray
+    :param tipIds: Landmark indices of the thumb, index, middle, ring and pinky tips
+    :return: Boolean array of shape (..., 5), True for fingers that are up
+    """
+    lmArray = np.asarray(lmArray)
+    handTypes = np.asarray(handTypes)
+    isRight = handTypes == "Right" if handTypes.dtype.kind in "US" else handTypes.astype(bool)
+    tipIds = np.asarray(tipIds)
+
+    # Thumb: compare x of the tip with the joint below, mirrored for left hands
+    thumbTip = lmArray[..., tipIds[0], 0]
+    thumbJoint = lmArray[..., tipIds[0] - 1, 0]
+    thumb = np.where(isRight, thumbTip > thumbJoint, thumbTip < thumbJoint)
+
+    # 4 Fingers: tip above the joint two below
+    fingers = lmArray[..., tipIds[1:], 1] < lmArray[..., tipIds[1:] - 2, 1]
+    return np.concatenate((thumb[..., None], fingers), axis=-1)
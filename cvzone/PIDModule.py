@@ -1,8 +1,6 @@
-import cvzone
 import cv2
 import numpy as np
 import time
-from cvzone.FaceDetectionModule import FaceDetector
 
 
 class PID:
@@ -47,6 +45,8 @@ class PID:
 
 
 def main():
+    from cvzone.FaceDetectionModule import FaceDetector
+
     cap = cv2.VideoCapture(2)
     detector = FaceDetector(minDetectionCon=0.8)
     # For a 640x480 image center target is 320 and 240
@@ -0,0 +1,284 @@
+"""
+Pipeline Module
+Runs capture, detection and rendering on separate threads
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import queue
+import threading
+import time
+
+import cv2
+
+
+def _putLatest(q, item):
+    """
+    Put an item in a bounded queue, dropping the oldest item if the queue is full.
+    :return: Number of items dropped (0 or 1)
+    """
+    dropped = 0
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+
+
+class StageStats:
+    """
+    Latency and drop counters for one pipeline stage.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.drops = 0
+        self.totalTime = 0.0
+        self.lastTime = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, t, drops=0):
+        with self.lock:
+            self.count += 1
+            self.drops += drops
+            self.totalTime += t
+            self.lastTime = t
+
+    def addDrops(self, drops):
+        with self.lock:
+            self.drops += drops
+
+    def getInfo(self):
+        """
+        :return: dict with the number of frames, dropped frames and the average and last latency in ms
+        """
+        with self.lock:
+            avg = self.totalTime / self.count if self.count else 0.0
+            return {"count": self.count, "drops": self.drops,
+                    "avgMs": avg * 1000, "lastMs": self.lastTime * 1000}
+
+
+class FrameGrabber:
+    """
+    Reads frames from a camera or video on a background thread and always
+    hands out the most recent one. Frames that were never read are dropped
+    and counted.
+    """
+
+    def __init__(self, source=0):
+        """
+        :param source: Camera index, video path or an already opened cv2.VideoCapture
+        """
+        if isinstance(source, (int, str)):
+            self.cap = cv2.VideoCapture(source)
+        else:
+            self.cap = source
+        self.stats = StageStats()
+        self.frameId = -1
+        self.img = None
+        self.tCapture = 0.0
+        self.running = False
+        self.ended = False
+        self.condition = threading.Condition()
+        self.thread = None
+        self.lastReadId = -1
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._update, daemon=True)
+        self.thread.start()
+        return self
+
+    def _update(self):
+        while self.running:
+            t0 = time.perf_counter()
+            success, img = self.cap.read()
+            t1 = time.perf_counter()
+            with self.condition:
+                if not success:
+                    self.ended = True
+                    self.condition.notify_all()
+                    break
+                # The previous frame was never handed out
+                drops = 1 if self.frameId > self.lastReadId else 0
+                self.frameId += 1
+                self.img = img
+                self.tCapture = t1
+                self.condition.notify_all()
+            self.stats.add(t1 - t0, drops)
+
+    def read(self, timeout=1.0):
+        """
+        Wait for a frame newer than the last one read.
+        :param timeout: Maximum time to wait in seconds
+        :return: success, img, frameId, capture timestamp (time.perf_counter)
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.frameId > self.lastReadId or self.ended or not self.running,
+                                    timeout)
+            if self.frameId <= self.lastReadId:
+                return False, None, self.frameId, 0.0
+            self.lastReadId = self.frameId
+            return True, self.img, self.frameId, self.tCapture
+
+    def stop(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        self.cap.release()
+
+
+class Pipeline:
+    """
+    Overlaps camera I/O, detection and rendering. A FrameGrabber thread keeps
+    the latest frame, a detection thread pulls frames from a bounded queue and
+    runs the detector, and rendering happens in the calling thread (needed
+    for cv2.imshow). When a stage falls behind, the oldest queued frame is
+    dropped so the output always stays close to real time.
+    """
+
+    def __init__(self, source, detect, render=None, queueSize=2):
+        """
+        :param source: Camera index, video path or an opened cv2.VideoCapture
+        :param detect: Function called with each frame that returns the detection result,
+                       e.g. lambda img: detector.findHands(img, draw=False)[0]
+        :param render: Function called with (img, result) in the rendering thread that
+                       returns the image to display. If None the frame is shown unchanged.
+        :param queueSize: Size of the queues between stages
+        """
+        self.grabber = FrameGrabber(source)
+        self.detect = detect
+        self.render = render
+        self.detectQueue = queue.Queue(maxsize=queueSize)
+        self.renderQueue = queue.Queue(maxsize=queueSize)
+        self.stats = {"capture": self.grabber.stats, "detect": StageStats(),
+                      "render": StageStats(), "endToEnd": StageStats()}
+        self.running = False
+        self.threads = []
+        self.error = None
+
+    def start(self):
+        self.running = True
+        self.error = None
+        self.grabber.start()
+        self.threads = [threading.Thread(target=self._feed, daemon=True),
+                        threading.Thread(target=self._detect, daemon=True)]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def _feed(self):
+        while self.running:
+            success, img, frameId, tCapture = self.grabber.read()
+            if success:
+                self.stats["detect"].addDrops(_putLatest(self.detectQueue, (img, tCapture)))
+            elif self.grabber.ended:
+                _putLatest(self.detectQueue, None)
+                break
+
+    def _detect(self):
+        while self.running:
+            try:
+                item = self.detectQueue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                _putLatest(self.renderQueue, None)
+                break
+            img, tCapture = item
+            t0 = time.perf_counter()
+            try:
+                result = self.detect(img)
+            except Exception as e:
+                # End the stream and hand the error to the rendering thread
+                self.error = e
+                _putLatest(self.renderQueue, None)
+                break
+            self.stats["detect"].add(time.perf_counter() - t0)
+            self.stats["render"].addDrops(_putLatest(self.renderQueue, (img, result, tCapture)))
+
+    def read(self, timeout=1.0):
+        """
+        Get the next detected frame and render it.
+        Raises the exception of the detect function if it failed.
+        :param timeout: Maximum time to wait in seconds
+        :return: success, rendered image, detection result
+        """
+        try:
+            item = self.renderQueue.get(timeout=timeout)
+        except queue.Empty:
+            return False, None, None
+        if item is None:
+            self.running = False
+            error, self.error = self.error, None
+            if error is not None:
+                raise error
+            return False, None, None
+        img, result, tCapture = item
+        t0 = time.perf_counter()
+        if self.render is not None:
+            img = self.render(img, result)
+        t1 = time.perf_counter()
+        self.stats["render"].add(t1 - t0)
+        self.stats["endToEnd"].add(t1 - tCapture)
+        return True, img, result
+
+    def run(self, windowName="Image"):
+        """
+        Show the rendered frames until 'q' is pressed or the source ends.
+        :param windowName: Name of the OpenCV window
+        """
+        if not self.running:
+            self.start()
+        try:
+            while self.running:
+                success, img, result = self.read()
+                if success:
+                    cv2.imshow(windowName, img)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            self.stop()
+
+    def getStats(self):
+        """
+        :return: dict with the count, drops, average and last latency (ms) of every stage
+        """
+        return {name: stats.getInfo() for name, stats in self.stats.items()}
+
+    def stop(self):
+        self.running = False
+        self.grabber.stop()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+
+
+def main():
+    from cvzone.HandTrackingModule import HandDetector
+
+    detector = HandDetector(staticMode=False, maxHands=2, modelComplexity=1, detectionCon=0.5, minTrackCon=0.5)
+
+    # Detection runs on its own thread, drawing happens in the main thread
+    def render(img, hands):
+        for hand in hands:
+            x, y, w, h = hand["bbox"]
+            cv2.rectangle(img, (x - 20, y - 20), (x + w + 20, y + h + 20), (255, 0, 255), 2)
+        return img
+
+    pipeline = Pipeline(0, detect=lambda img: detector.findHands(img, draw=False)[0], render=render)
+    pipeline.run()
+
+    # Per stage latency and the number of frames dropped to stay real time
+    for stage, info in pipeline.getStats().items():
+        print(stage, info)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ class LivePlot:
     """
 
     def __init__(self, w=640, h=480, yLimit=[0, 100],
-                 interval=0.001, invert=True, char='Y'):
+                 interval=0.001, invert=True, char='Y', historyLength=100, capacity=None, numSeries=1):
         """
         Initialize the LivePlot object.
 
@@ -21,6 +21,9 @@ class LivePlot:
         :param interval: Time interval for updating the plot
         :param invert: Whether to invert the y-axis
         :param char: A character to display on the plot for annotation
+        :param historyLength: Number of samples shown across the plot
+        :param capacity: Number of samples kept in memory, at least historyLength (default)
+        :param numSeries: Number of lines drawn on the plot, update then takes one value per line
         """
 
         self.yLimit = yLimit
@@ -29,52 +32,81 @@ class LivePlot:
         self.invert = invert
         self.interval = interval
         self.char = char[0]
+        self.historyLength = historyLength
+        self.capacity = max(capacity or historyLength, historyLength)
+        self.numSeries = numSeries
         self.imgPlot = np.zeros((self.h, self.w, 3), np.uint8)
         self.imgPlot[:] = 225, 225, 225
         self.xP = 0
         self.yP = 0
-        self.yList = []
-        self.xList = [x for x in range(0, 100)]
         self.ptime = 0
 
+        # The grid and labels never change, so they are drawn once and copied on every update
+        self.drawBackground()
+        self.imgBackground = self.imgPlot.copy()
+
+        # Ring buffer of the samples, written twice so the last samples are always one contiguous slice
+        self.samples = np.zeros((numSeries, 2 * self.capacity))
+        self.head = 0
+        self.count = 0
+
+        # Pixel coordinates of the lines, x is fixed
+        self.points = np.zeros((numSeries, historyLength, 2), np.int32)
+        self.points[:, :, 0] = np.arange(historyLength) * self.w // historyLength - self.w // 10
+
     def update(self, y, color=(255, 0, 255)):
         """
         Update the plot with a new y-value.
 
-        :param y: The new y-value to plot
-        :param color: RGB color for the plot line
+        :param y: The new y-value to plot, or a list with one value per series
+        :param color: RGB color for the plot line, or a list with one color per series
 
         :return: Updated image of the plot
         """
 
         # Check if enough time has passed for an update
         if time.time() - self.ptime > self.interval:
-            self.imgPlot[:] = 225, 225, 225  # Refresh
-            self.drawBackground()  # Draw static parts
-            cv2.putText(self.imgPlot, str(y), (self.w - 125, 50), cv2.FONT_HERSHEY_PLAIN, 3, (150, 150, 150), 3)
-
-            # Interpolate y-value to plot height
-            if self.invert:
-                self.yP = int(np.interp(y, self.yLimit, [self.h, 0]))
+            values = np.broadcast_to(np.asarray(y, dtype=np.float64).reshape(-1), (self.numSeries,))
+            self.samples[:, self.head] = values
+            self.samples[:, self.head + self.capacity] = values
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+            self.imgPlot[:] = self.imgBackground  # Refresh with the cached static parts
+            colors = [color] * self.numSeries if isinstance(color[0], (int, np.integer)) else color
+            if self.numSeries == 1:
+                cv2.putText(self.imgPlot, str(y), (self.w - 125, 50), cv2.FONT_HERSHEY_PLAIN, 3, (150, 150, 150), 3)
             else:
-                self.yP = int(np.interp(y, self.yLimit, [0, self.h]))
-
-            self.yList.append(self.yP)
-            if len(self.yList) == 100:
-                self.yList.pop(0)
-
-            # Draw plot lines
-            for i in range(2, len(self.yList)):
-                x1 = int((self.xList[i - 1] * (self.w // 100)) - (self.w // 10))
-                y1 = self.yList[i - 1]
-                x2 = int((self.xList[i] * (self.w // 100)) - (self.w // 10))
-                y2 = self.yList[i]
-                cv2.line(self.imgPlot, (x1, y1), (x2, y2), color, 2)
+                for i, (value, seriesColor) in enumerate(zip(values.tolist(), colors)):
+                    cv2.putText(self.imgPlot, f'{value:.1f}', (self.w - 125, 50 + 40 * i),
+                                cv2.FONT_HERSHEY_PLAIN, 2, seriesColor, 2)
+
+            # Interpolate the shown samples to plot height
+            n = min(self.count, self.historyLength)
+            end = self.head + self.capacity
+            yRange = [self.h, 0] if self.invert else [0, self.h]
+            np.copyto(self.points[:, :n, 1], np.interp(self.samples[:, end - n:end], self.yLimit, yRange),
+                      casting='unsafe')
+            self.yP = int(self.points[0, n - 1, 1])
+
+            # Draw each line with a single call
+            for points, seriesColor in zip(self.points, colors):
+                cv2.polylines(self.imgPlot, [points[:n]], False, seriesColor, 2)
 
             self.ptime = time.time()
 
         return self.imgPlot
 
+    def getValues(self):
+        """
+        The samples kept in memory, oldest first.
+
+        :return: Array of shape (count,), or (numSeries, count) for several series
+        """
+        end = self.head + self.capacity
+        values = self.samples[:, end - self.count:end].copy()
+        return values[0] if self.numSeries == 1 else values
+
     def drawBackground(self):
         """
         Draw the static background elements of the plot.
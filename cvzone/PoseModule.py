@@ -7,6 +7,11 @@ import math
 
 import cv2
 import mediapipe as mp
+import numpy as np
+
+from cvzone.LandmarkModule import landmarksToArray, jointAngles
+from cvzone.ProfilerModule import callTimer
+from cvzone.Utils import toRGB
 
 
 class PoseDetector:
@@ -47,29 +52,47 @@ class PoseDetector:
                                      min_detection_confidence=self.detectionCon,
                                      min_tracking_confidence=self.trackCon)
 
-    def findPose(self, img, draw=True):
+    def findPose(self, img, draw=True, rgb=None):
         """
         Find the pose landmarks in an Image of BGR color space.
         :param img: Image to find the pose in.
         :param draw: Flag to draw the output on the image.
+        :param rgb: RGB version of img, e.g. SharedFrame.rgb, so several detectors convert the frame only once
         :return: Image with or without drawings
         """
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        timer = callTimer("findPose")
+        imgRGB = toRGB(img, rgb)
+        timer.lap("convert")
         self.results = self.pose.process(imgRGB)
+        timer.lap("process")
         if self.results.pose_landmarks:
             if draw:
                 self.mpDraw.draw_landmarks(img, self.results.pose_landmarks,
                                            self.mpPose.POSE_CONNECTIONS)
+                timer.lap("draw")
+        timer.end()
         return img
 
-    def findPosition(self, img, draw=True, bboxWithHands=False):
+    def findPosition(self, img, draw=True, bboxWithHands=False, asArray=False):
+        """
+        Get the landmark positions of the pose found by findPose.
+        :param img: Image the pose was found in.
+        :param draw: Flag to draw the bounding box on the image.
+        :param bboxWithHands: Include the hands in the bounding box.
+        :param asArray: Return a float32 array of shape (33, 4) with x, y, z in pixels and
+                        the visibility (0 to 1) instead of a list. Empty (0, 4) if no pose is found.
+        :return: Landmark list or array, bounding box info
+        """
+        timer = callTimer("findPosition")
         self.lmList = []
         self.bboxInfo = {}
+        self.lmArray = np.zeros((0, 4), np.float32)
         if self.results.pose_landmarks:
-            for id, lm in enumerate(self.results.pose_landmarks.landmark):
-                h, w, c = img.shape
-                cx, cy, cz = int(lm.x * w), int(lm.y * h), int(lm.z * w)
-                self.lmList.append([cx, cy, cz])
+            h, w, c = img.shape
+            lmRaw = landmarksToArray([self.results.pose_landmarks], w, h,
+                                     dtype=np.float64, visibility=True)[0]
+            self.lmArray = lmRaw.astype(np.float32)
+            self.lmList = lmRaw[:, :3].astype(np.int32).tolist()
 
             # Bounding Box
             ad = abs(self.lmList[12][0] - self.lmList[11][0]) // 2
@@ -87,11 +110,16 @@ class PoseDetector:
                      bbox[1] + bbox[3] // 2
 
             self.bboxInfo = {"bbox": bbox, "center": (cx, cy)}
+            timer.lap("landmarks")
 
             if draw:
                 cv2.rectangle(img, bbox, (255, 0, 255), 3)
                 cv2.circle(img, (cx, cy), 5, (255, 0, 0), cv2.FILLED)
+                timer.lap("draw")
 
+        timer.end()
+        if asArray:
+            return self.lmArray, self.bboxInfo
         return self.lmList, self.bboxInfo
 
     def findDistance(self, p1, p2, img=None, color=(255, 0, 255), scale=5):
@@ -154,6 +182,17 @@ class PoseDetector:
                         cv2.FONT_HERSHEY_PLAIN, 2, color, max(1,scale//5))
         return angle, img
 
+    def findAngles(self, lmArray, triplets):
+        """
+        Finds many angles at once, e.g. all joint angles of a frame or of a whole recording.
+
+        :param lmArray: Landmarks from findPosition, shape (33, 2+), or a time series (nFrames, 33, 2+)
+        :param triplets: Array of shape (N, 3) with the landmark indices p1, p2, p3 of each angle,
+                         the angle is measured at p2
+        :return: Angles in degrees, shape (N,) or (nFrames, N)
+        """
+        return jointAngles(lmArray, triplets)
+
     def angleCheck(self, myAngle, targetAngle, offset=20):
         return targetAngle - offset < myAngle < targetAngle + offset
 
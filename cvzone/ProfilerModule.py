@@ -0,0 +1,261 @@
+"""
+Profiler Module
+Opt-in timing of the phases of every detector call, e.g. color conversion,
+mediapipe processing, landmark conversion and drawing
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import bisect
+import json
+import socket
+import threading
+import time
+
+# Upper bounds of the histogram buckets in seconds, from 50 us to 5 s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005,
+                   0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+
+class Histogram:
+    """
+    Fixed bucket histogram of durations. Recording is a bisect and two additions.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the buckets in seconds, a last +Inf bucket is added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+        :param q: Quantile between 0 and 1
+        :return: Duration in seconds
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - cumulative) / n
+            cumulative += n
+        return self.max
+
+    def getStats(self):
+        """
+        :return: dict with count, and the mean, p50, p95, p99 and max in ms
+        """
+        mean = self.sum / self.count if self.count else 0.0
+        return {"count": self.count, "mean": mean * 1000, "p50": self.quantile(0.5) * 1000,
+                "p95": self.quantile(0.95) * 1000, "p99": self.quantile(0.99) * 1000, "max": self.max * 1000}
+
+
+class Profiler:
+    """
+    Collects a histogram for every (method, phase) pair, e.g. ("findHands", "process").
+    Every call also records a "total" phase.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of the histogram buckets in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def record(self, method, phase, seconds):
+        """
+        Add one duration.
+        :param method: Name of the detector method e.g. "findHands"
+        :param phase: Name of the phase e.g. "convert", "process", "landmarks", "draw"
+        :param seconds: Duration in seconds
+        """
+        key = (method, phase)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.record(seconds)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+
+    def getStats(self):
+        """
+        :return: dict {method: {phase: stats}} with the count, mean, p50, p95, p99 and max in ms of each phase
+        """
+        stats = {}
+        with self.lock:
+            for (method, phase), histogram in self.histograms.items():
+                stats.setdefault(method, {})[phase] = histogram.getStats()
+        return stats
+
+    def toJSON(self):
+        """
+        :return: JSON text with the stats and the raw bucket counts of every phase
+        """
+        data = {"buckets": list(self.buckets), "methods": {}}
+        with self.lock:
+            for (method, phase), histogram in self.histograms.items():
+                phaseData = histogram.getStats()
+                phaseData["sum"] = histogram.sum
+                phaseData["counts"] = list(histogram.counts)
+                data["methods"].setdefault(method, {})[phase] = phaseData
+        return json.dumps(data, indent=2)
+
+    def toPrometheus(self, name="cvzone_phase_seconds"):
+        """
+        :param name: Metric name
+        :return: Text in the Prometheus exposition format, one histogram per method and phase
+        """
+        lines = [f"# HELP {name} Time spent in each phase of the cvzone detector methods",
+                 f"# TYPE {name} histogram"]
+        with self.lock:
+            for (method, phase), histogram in sorted(self.histograms.items()):
+                labels = f'method="{method}",phase="{phase}"'
+                cumulative = 0
+                for bound, n in zip(self.buckets + ("+Inf",), histogram.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, target, format="json"):
+        """
+        Write the data to a file or send it to a socket.
+        :param target: File path, or (host, port) of a TCP socket
+        :param format: "json" or "prometheus"
+        """
+        if format == "json":
+            text = self.toJSON()
+        elif format == "prometheus":
+            text = self.toPrometheus()
+        else:
+            raise ValueError('format must be "json" or "prometheus"')
+        if isinstance(target, tuple):
+            with socket.create_connection(target) as connection:
+                connection.sendall(text.encode())
+        else:
+            with open(target, "w") as f:
+                f.write(text)
+
+
+class _CallTimer:
+    """
+    Times the phases of one detector call. Each lap records the time since the previous one.
+    """
+
+    __slots__ = ("profiler", "method", "start", "last")
+
+    def __init__(self, profiler, method):
+        self.profiler = profiler
+        self.method = method
+        self.start = self.last = time.perf_counter_ns()
+
+    def lap(self, phase):
+        now = time.perf_counter_ns()
+        self.profiler.record(self.method, phase, (now - self.last) / 1e9)
+        self.last = now
+
+    def end(self):
+        self.profiler.record(self.method, "total", (time.perf_counter_ns() - self.start) / 1e9)
+
+
+class _NullTimer:
+    """
+    Timer used while profiling is disabled, does nothing.
+    """
+
+    __slots__ = ()
+
+    def lap(self, phase):
+        pass
+
+    def end(self):
+        pass
+
+
+_nullTimer = _NullTimer()
+_profiler = None
+
+
+def enableProfiling(buckets=DEFAULT_BUCKETS):
+    """
+    Start recording the phases of all detector calls.
+    :param buckets: Sorted upper bounds of the histogram buckets in seconds
+    :return: The Profiler the data is recorded in
+    """
+    global _profiler
+    _profiler = Profiler(buckets)
+    return _profiler
+
+
+def disableProfiling():
+    """
+    Stop recording. The detectors then only pay for a call to a no-op timer.
+    :return: The Profiler with the data recorded so far, or None
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def getProfiler():
+    """
+    :return: The active Profiler, or None if profiling is disabled
+    """
+    return _profiler
+
+
+def callTimer(method):
+    """
+    Timer for one call of a detector method.
+    :param method: Name of the method e.g. "findHands"
+    :return: A timer with lap(phase) and end(), a shared no-op timer if profiling is disabled
+    """
+    if _profiler is None:
+        return _nullTimer
+    return _CallTimer(_profiler, method)
+
+
+def main():
+    import cv2
+    from cvzone.HandTrackingModule import HandDetector
+
+    cap = cv2.VideoCapture(0)
+    detector = HandDetector(staticMode=False, maxHands=2)
+    profiler = enableProfiling()
+
+    for _ in range(300):
+        success, img = cap.read()
+        hands, img = detector.findHands(img, draw=True)
+        cv2.imshow("Image", img)
+        cv2.waitKey(1)
+
+    # Time of each phase of findHands
+    for phase, stats in profiler.getStats()["findHands"].items():
+        print(f'{phase:<10} mean: {stats["mean"]:.2f} ms  p99: {stats["p99"]:.2f} ms')
+    profiler.dump("profile.prom", format="prometheus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Scheduler Module
+Runs several detectors on the same frame at the same time, each at its own rate
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from cvzone.DetectorPoolModule import detectHands, detectPose, detectFaceMesh, detectFaces
+from cvzone.Utils import SharedFrame
+
+
+def _defaultDetect(detector):
+    if hasattr(detector, "findHands"):
+        return detectHands
+    if hasattr(detector, "findFaceMesh"):
+        return detectFaceMesh
+    if hasattr(detector, "findPosition"):
+        return detectPose
+    if hasattr(detector, "findFaces"):
+        return detectFaces
+    raise ValueError(f"No default detect function for {type(detector).__name__}, "
+                     f"give (detector, detect) with detect(detector, img, rgb)")
+
+
+class DetectorScheduler:
+    """
+    Sends each frame to several detectors at once on a thread pool and merges
+    their results into one record. mediapipe releases the GIL while a model
+    runs, so the time per frame is close to the slowest model instead of the
+    sum of all of them. Each detector can have a rate limit, on the frames in
+    between its last result is reused.
+    """
+
+    def __init__(self, detectors, rates=None):
+        """
+        :param detectors: dict {name: detector} or {name: (detector, detect)}. detect(detector, img, rgb)
+                          returns the result, detectHands, detectPose, detectFaceMesh and detectFaces
+                          from the DetectorPoolModule are used by default.
+        :param rates: dict {name: maximum runs per second}, e.g. {"pose": 15, "hands": 30}.
+                      Detectors without a rate run on every frame.
+        """
+        self.detectors = {}
+        for name, value in detectors.items():
+            detector, detect = value if isinstance(value, tuple) else (value, _defaultDetect(value))
+            self.detectors[name] = (detector, detect)
+        self.rates = dict(rates or {})
+        self.pool = ThreadPoolExecutor(max_workers=len(self.detectors))
+        self.frameId = 0
+        self.lastRun = {name: None for name in self.detectors}
+        self.lastResult = {name: None for name in self.detectors}
+        self.stats = {name: {"runs": 0, "skips": 0, "totalMs": 0.0, "lastMs": 0.0} for name in self.detectors}
+
+    def _due(self, name, now):
+        rate = self.rates.get(name)
+        last = self.lastRun[name]
+        return not rate or last is None or now - last >= 1 / rate
+
+    @staticmethod
+    def _timed(detect, detector, img, rgb):
+        start = time.perf_counter()
+        result = detect(detector, img, rgb)
+        return result, (time.perf_counter() - start) * 1000
+
+    def process(self, img):
+        """
+        Run the detectors that are due on a frame and wait for them.
+        :param img: BGR image. The detectors do not draw on it.
+        :return: dict with frameId, results {name: result}, updated {name: True if the detector ran on
+                 this frame, False if its last result was reused}, latencyMs {name: ms of the detectors
+                 that ran} and totalMs
+        """
+        start = time.perf_counter()
+        frame = SharedFrame(img)
+        rgb = frame.rgb  # Converted once here, before the threads share it
+
+        futures = {}
+        for name, (detector, detect) in self.detectors.items():
+            if self._due(name, start):
+                self.lastRun[name] = start
+                futures[name] = self.pool.submit(self._timed, detect, detector, img, rgb)
+            else:
+                self.stats[name]["skips"] += 1
+
+        latency = {}
+        for name, future in futures.items():
+            self.lastResult[name], latency[name] = future.result()
+            stats = self.stats[name]
+            stats["runs"] += 1
+            stats["totalMs"] += latency[name]
+            stats["lastMs"] = latency[name]
+
+        record = {"frameId": self.frameId, "results": dict(self.lastResult),
+                  "updated": {name: name in futures for name in self.detectors},
+                  "latencyMs": latency, "totalMs": (time.perf_counter() - start) * 1000}
+        self.frameId += 1
+        return record
+
+    def getStats(self):
+        """
+        :return: dict {name: {"runs", "skips", "avgMs", "lastMs"}}
+        """
+        return {name: {"runs": s["runs"], "skips": s["skips"], "lastMs": s["lastMs"],
+                       "avgMs": s["totalMs"] / s["runs"] if s["runs"] else 0.0}
+                for name, s in self.stats.items()}
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main():
+    from cvzone.HandTrackingModule import HandDetector
+    from cvzone.PoseModule import PoseDetector
+    from cvzone.FaceMeshModule import FaceMeshDetector
+
+    cap = cv2.VideoCapture(0)
+    detectors = {"hands": HandDetector(maxHands=2), "pose": PoseDetector(), "faceMesh": FaceMeshDetector(maxFaces=1)}
+
+    # Hands on every frame, pose and face mesh at most 15 times per second
+    with DetectorScheduler(detectors, rates={"pose": 15, "faceMesh": 15}) as scheduler:
+        while True:
+            success, img = cap.read()
+            record = scheduler.process(img)
+
+            hands = record["results"]["hands"]
+            lmList, bboxInfo = record["results"]["pose"]
+            for hand in hands:
+                x, y, w, h = hand["bbox"]
+                cv2.rectangle(img, (x, y), (x + w, y + h), (255, 0, 255), 2)
+            if bboxInfo:
+                cv2.rectangle(img, bboxInfo["bbox"], (0, 255, 0), 2)
+            for face in record["results"]["faceMesh"]:
+                for x, y in face[::10]:
+                    cv2.circle(img, (x, y), 2, (0, 255, 255), cv2.FILLED)
+
+            cv2.putText(img, f'{record["totalMs"]:.1f} ms', (20, 50), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 255), 2)
+            cv2.imshow("Image", img)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+        print(scheduler.getStats())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import mediapipe as mp
 import numpy as np
 
 import cvzone
+from cvzone.ProfilerModule import callTimer
+from cvzone.Utils import toRGB
 
 
 class SelfiSegmentation():
@@ -16,16 +18,20 @@ class SelfiSegmentation():
         self.mpSelfieSegmentation = mp.solutions.selfie_segmentation
         self.selfieSegmentation = self.mpSelfieSegmentation.SelfieSegmentation(model_selection=self.model)
 
-    def removeBG(self, img, imgBg=(255, 255, 255), cutThreshold=0.1):
+    def removeBG(self, img, imgBg=(255, 255, 255), cutThreshold=0.1, rgb=None):
         """
 
         :param img: image to remove background from
         :param imgBg: Background Image. can be a color (255,0,255) or an image . must be same size
         :param cutThreshold: higher = more cut, lower = less cut
+        :param rgb: RGB version of img, e.g. SharedFrame.rgb, so several detectors convert the frame only once
         :return:
         """
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        timer = callTimer("removeBG")
+        imgRGB = toRGB(img, rgb)
+        timer.lap("convert")
         results = self.selfieSegmentation.process(imgRGB)
+        timer.lap("process")
         condition = np.stack(
             (results.segmentation_mask,) * 3, axis=-1) > cutThreshold
         if isinstance(imgBg, tuple):
@@ -34,6 +40,8 @@ class SelfiSegmentation():
             imgOut = np.where(condition, img, _imgBg)
         else:
             imgOut = np.where(condition, img, imgBg)
+        timer.lap("composite")
+        timer.end()
         return imgOut
 
 
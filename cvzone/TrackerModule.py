@@ -0,0 +1,235 @@
+"""
+Tracker Module
+Gives the faces and hands found by the detectors stable ids across frames
+By: Computer Vision Zone
+Website: https://www.computervision.zone/
+"""
+
+import cv2
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Cost given to pairs that are not allowed to match
+_INFEASIBLE = 1e6
+
+
+def iouMatrix(boxesA, boxesB):
+    """
+    Intersection over union of every pair of boxes.
+    :param boxesA: Array of shape (n, 4) as x, y, w, h
+    :param boxesB: Array of shape (m, 4) as x, y, w, h
+    :return: Array of shape (n, m)
+    """
+    a = np.asarray(boxesA, np.float64)[:, None, :]
+    b = np.asarray(boxesB, np.float64)[None, :, :]
+    x1 = np.maximum(a[..., 0], b[..., 0])
+    y1 = np.maximum(a[..., 1], b[..., 1])
+    x2 = np.minimum(a[..., 0] + a[..., 2], b[..., 0] + b[..., 2])
+    y2 = np.minimum(a[..., 1] + a[..., 3], b[..., 1] + b[..., 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = a[..., 2] * a[..., 3] + b[..., 2] * b[..., 3] - inter
+    return np.where(union > 0, inter / np.where(union > 0, union, 1), 0.0)
+
+
+def _hungarian(cost):
+    """
+    Minimum cost assignment (Hungarian algorithm with potentials), vectorized over the columns.
+    :param cost: Array of shape (n, m) with n <= m
+    :return: rows, cols of the assigned pairs
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, np.int64)  # row (1 based) assigned to each column
+    way = np.zeros(m + 1, np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            cur = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1 - 1]
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    cols = np.nonzero(p[1:])[0]
+    return p[1:][cols] - 1, cols
+
+
+def linearAssignment(cost):
+    """
+    Minimum cost assignment between the rows and columns of a cost matrix.
+    Uses scipy when it is installed and a NumPy Hungarian algorithm otherwise.
+    :param cost: Array of shape (n, m)
+    :return: rows, cols of the assigned pairs, sorted by row
+    """
+    cost = np.asarray(cost, np.float64)
+    if cost.size == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(cost)
+        return rows, cols
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _hungarian(cost.T)
+    else:
+        rows, cols = _hungarian(cost)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class ObjectTracker:
+    """
+    Assigns stable track ids to the bounding boxes found by FaceDetector,
+    HandDetector or any other detector. Boxes are matched to the tracks of
+    the previous frames with the Hungarian algorithm on an IoU or center
+    distance cost matrix. Tracks that are not seen are kept for maxAge
+    frames, moving with their last velocity, so an object that disappears
+    briefly gets its old id back.
+    """
+
+    def __init__(self, metric="iou", minIou=0.2, maxDistance=100, maxAge=30):
+        """
+        :param metric: "iou" or "centroid"
+        :param minIou: Minimum IoU to match a box to a track (metric "iou")
+        :param maxDistance: Maximum center distance in pixels to match a box to a track (metric "centroid")
+        :param maxAge: Number of frames a lost track can still be re-identified
+        """
+        if metric not in ("iou", "centroid"):
+            raise ValueError('metric must be "iou" or "centroid"')
+        self.metric = metric
+        self.minIou = minIou
+        self.maxDistance = maxDistance
+        self.maxAge = maxAge
+        self.ids = np.zeros(0, np.int64)
+        self.boxes = np.zeros((0, 4))
+        self.velocity = np.zeros((0, 2))
+        self.age = np.zeros(0, np.int64)
+        self.hits = np.zeros(0, np.int64)
+        self.nextId = 0
+
+    def _cost(self, boxes, predicted):
+        if self.metric == "iou":
+            iou = iouMatrix(boxes, predicted)
+            return np.where(iou >= self.minIou, 1 - iou, _INFEASIBLE)
+        centers = boxes[:, :2] + boxes[:, 2:] / 2
+        trackCenters = predicted[:, :2] + predicted[:, 2:] / 2
+        dist = np.linalg.norm(centers[:, None, :] - trackCenters[None, :, :], axis=2)
+        return np.where(dist <= self.maxDistance, dist, _INFEASIBLE)
+
+    def updateBoxes(self, bboxes):
+        """
+        Match the boxes of the current frame to the tracks.
+        :param bboxes: Array-like of shape (n, 4) as x, y, w, h
+        :return: Track id of every box, shape (n,)
+        """
+        boxes = np.asarray(bboxes, np.float64).reshape(-1, 4)
+        n = len(boxes)
+
+        # Lost tracks are searched where their last velocity would have taken them
+        predicted = self.boxes.copy()
+        predicted[:, :2] += self.velocity * (self.age + 1)[:, None]
+
+        trackIdx = np.full(n, -1, np.int64)
+        if n and len(self.ids):
+            cost = self._cost(boxes, predicted)
+            rows, cols = linearAssignment(cost)
+            valid = cost[rows, cols] < _INFEASIBLE
+            trackIdx[rows[valid]] = cols[valid]
+
+        matched = trackIdx >= 0
+        rows = trackIdx[matched]
+        if len(rows):
+            steps = (self.age[rows] + 1)[:, None]
+            self.velocity[rows] = (boxes[matched, :2] - self.boxes[rows, :2]) / steps
+            self.boxes[rows] = boxes[matched]
+            self.hits[rows] += 1
+
+        seen = np.zeros(len(self.ids), bool)
+        seen[rows] = True
+        self.age[~seen] += 1
+        self.age[seen] = 0
+
+        # Unmatched boxes start new tracks
+        new = ~matched
+        numNew = int(new.sum())
+        newIds = np.arange(self.nextId, self.nextId + numNew)
+        self.nextId += numNew
+        self.ids = np.concatenate((self.ids, newIds))
+        self.boxes = np.concatenate((self.boxes, boxes[new]))
+        self.velocity = np.concatenate((self.velocity, np.zeros((numNew, 2))))
+        self.age = np.concatenate((self.age, np.zeros(numNew, np.int64)))
+        self.hits = np.concatenate((self.hits, np.ones(numNew, np.int64)))
+
+        ids = np.empty(n, np.int64)
+        ids[matched] = self.ids[rows]
+        ids[new] = newIds
+
+        keep = self.age <= self.maxAge
+        if not keep.all():
+            self.ids, self.boxes, self.velocity = self.ids[keep], self.boxes[keep], self.velocity[keep]
+            self.age, self.hits = self.age[keep], self.hits[keep]
+        return ids
+
+    def update(self, detections):
+        """
+        Add a stable "id" to the output of a detector.
+        :param detections: List of dicts with a "bbox" key (FaceDetector.findFaces, HandDetector.findHands),
+                           the dict of arrays of findHands(asArray=True), or an array of boxes (n, 4)
+        :return: The detections with their "id" set. For an array of boxes, the array of ids.
+        """
+        if isinstance(detections, dict):
+            detections["id"] = self.updateBoxes(detections["bbox"])
+            return detections
+        if isinstance(detections, np.ndarray):
+            return self.updateBoxes(detections)
+        ids = self.updateBoxes([detection["bbox"] for detection in detections])
+        for detection, trackId in zip(detections, ids.tolist()):
+            detection["id"] = trackId
+        return detections
+
+
+def main():
+    from cvzone.FaceDetectionModule import FaceDetector
+    import cvzone
+
+    cap = cv2.VideoCapture(0)
+    detector = FaceDetector(minDetectionCon=0.5, modelSelection=0)
+    tracker = ObjectTracker(metric="iou", minIou=0.2, maxAge=30)
+
+    while True:
+        success, img = cap.read()
+        img, bboxs = detector.findFaces(img, draw=False)
+
+        # "id" now stays with the same face from frame to frame
+        for bboxInfo in tracker.update(bboxs):
+            x, y, w, h = bboxInfo["bbox"]
+            cvzone.cornerRect(img, (x, y, w, h))
+            cvzone.putTextRect(img, f'ID {bboxInfo["id"]}', (x, y - 10), scale=2, thickness=2)
+
+        cv2.imshow("Image", img)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -4,51 +4,88 @@ By: Computer Vision Zone
 Website: https://www.computervision.zone/
 """
 
-import copy
-import urllib.request
 import cv2
 import numpy as np
 
 
+# Color conversions from the channels of an image to the channels of the stacking canvas
+_stackConversions = {1: {3: cv2.COLOR_GRAY2BGR, 4: cv2.COLOR_GRAY2BGRA},
+                     3: {4: cv2.COLOR_BGR2BGRA},
+                     4: {}}
+
+
+class ImageStacker:
+    """
+    Stacks images into a grid on a canvas that is allocated once and reused
+    across calls. Every image is resized a single time straight into its cell
+    and grayscale images are converted to BGR in place, so the inputs are never
+    copied. Meant for debug dashboards that stack images on every frame.
+    """
+
+    def __init__(self, cols, scale):
+        """
+        :param cols: the num of img in a row
+        :param scale: bigger~1+ ans smaller~1-
+        """
+        self.cols = cols
+        self.scale = scale
+        self.canvas = None
+        self._grayBuffer = None
+
+    def stack(self, imgList):
+        """
+        Stack the images, using the size of the first image for every cell.
+        The canvas has the common dtype of the images, and 4 channels if any of them has an alpha channel.
+        :param imgList: list of images to stack
+        :return: Stacked Image. This is the reused canvas, copy it to keep it past the next call.
+        """
+        height1, width1 = imgList[0].shape[:2]
+        cellW, cellH = round(width1 * self.scale), round(height1 * self.scale)
+        rows = -(-len(imgList) // self.cols)
+        channels = 4 if any(img.ndim == 3 and img.shape[2] == 4 for img in imgList) else 3
+        dtype = np.result_type(*[img.dtype for img in imgList])
+
+        shape = (rows * cellH, self.cols * cellW, channels)
+        if self.canvas is None or self.canvas.shape != shape or self.canvas.dtype != dtype:
+            self.canvas = np.zeros(shape, dtype)
+            self._grayBuffer = np.empty((cellH, cellW), dtype)
+
+        for i in range(rows * self.cols):
+            y, x = (i // self.cols) * cellH, (i % self.cols) * cellW
+            cell = self.canvas[y:y + cellH, x:x + cellW]
+            if i >= len(imgList):
+                # make the grid full by adding blank cells
+                cell[:] = 0
+                continue
+            img = imgList[i]
+            imgChannels = 1 if img.ndim == 2 else img.shape[2]
+            if imgChannels not in _stackConversions:
+                raise ValueError(f"Can not stack an image with {imgChannels} channels")
+            if img.dtype == dtype and imgChannels == channels:
+                cv2.resize(img, (cellW, cellH), dst=cell, interpolation=cv2.INTER_AREA)
+            elif img.dtype == dtype and imgChannels == 1:
+                cv2.resize(img, (cellW, cellH), dst=self._grayBuffer, interpolation=cv2.INTER_AREA)
+                cv2.cvtColor(self._grayBuffer, _stackConversions[1][channels], dst=cell)
+            else:
+                # cv2 would return a new array instead of writing into a cell of another format
+                resized = cv2.resize(img, (cellW, cellH), interpolation=cv2.INTER_AREA)
+                if imgChannels != channels:
+                    resized = cv2.cvtColor(resized, _stackConversions[imgChannels][channels])
+                cell[:] = resized
+
+        return self.canvas
+
+
 def stackImages(_imgList, cols, scale):
     """
     Stack Images together to display in a single window
+    Use ImageStacker instead to reuse the output canvas between frames.
     :param _imgList: list of images to stack
     :param cols: the num of img in a row
     :param scale: bigger~1+ ans smaller~1-
     :return: Stacked Image
     """
-    imgList = copy.deepcopy(_imgList)
-
-    # Get dimensions of the first image
-    width1, height1 = imgList[0].shape[1], imgList[0].shape[0]
-
-    # make the array full by adding blank img, otherwise the openCV can't work
-    totalImages = len(imgList)
-    rows = totalImages // cols if totalImages // cols * cols == totalImages else totalImages // cols + 1
-    blankImages = cols * rows - totalImages
-
-    # Create a blank image with dimensions of the first image
-    imgBlank = np.zeros((height1, width1, 3), np.uint8)
-    imgList.extend([imgBlank] * blankImages)
-
-    # resize the images to be the same as the first image and apply scaling
-    for i in range(cols * rows):
-        imgList[i] = cv2.resize(imgList[i], (width1, height1), interpolation=cv2.INTER_AREA)
-        imgList[i] = cv2.resize(imgList[i], (0, 0), None, scale, scale)
-
-        if len(imgList[i].shape) == 2:  # Convert grayscale to color if necessary
-            imgList[i] = cv2.cvtColor(imgList[i], cv2.COLOR_GRAY2BGR)
-
-    # put the images in a board
-    hor = [imgBlank] * rows
-    for y in range(rows):
-        line = []
-        for x in range(cols):
-            line.append(imgList[y * cols + x])
-        hor[y] = np.hstack(line)
-    ver = np.vstack(hor)
-    return ver
+    return ImageStacker(cols, scale).stack(_imgList)
 
 
 def cornerRect(img, bbox, l=30, t=5, rt=1,
@@ -133,47 +170,186 @@ def findContours(img, imgPre, minArea=1000, maxArea=float('inf'), sort=True,
     return imgContours, conFound
 
 
-def overlayPNG(imgBack, imgFront, pos=[0, 0]):
+def _overlayRegion(pos, wf, hf, wb, hb):
+    """
+    Clips an overlay of size (wf, hf) placed at pos against a background of size (wb, hb).
+
+    :return: (x1, y1, x2, y2) in the background and (x1, y1) in the overlay,
+             or None if the overlay is completely outside the background.
+    """
+    x1, y1 = max(pos[0], 0), max(pos[1], 0)
+    x2, y2 = min(pos[0] + wf, wb), min(pos[1] + hf, hb)
+
+    # For negative positions, change the starting position in the overlay image
+    x1_overlay = 0 if pos[0] >= 0 else -pos[0]
+    y1_overlay = 0 if pos[1] >= 0 else -pos[1]
+
+    if x2 - x1 <= 0 or y2 - y1 <= 0:
+        return None
+    return (x1, y1, x2, y2), (x1_overlay, y1_overlay)
+
+
+class PNGSprite:
+    """
+    A PNG image prepared once so it can be overlaid many times at low cost.
+    The colour channels are stored premultiplied by alpha and the inverse alpha
+    is kept next to them, both as uint16 fixed point. Blending is then done with
+    integer arithmetic directly inside the background region, without float
+    temporaries or a loop over the channels.
+    """
+
+    def __init__(self, imgFront):
+        """
+        :param imgFront: The foreground PNG image, a NumPy array of shape (height, width, 4).
+        """
+        self.h, self.w = imgFront.shape[:2]
+        # Alpha is repeated over the three channels so blending needs no broadcasting
+        alpha = np.repeat(imgFront[:, :, 3:4], 3, axis=2).astype(np.uint16)
+
+        # Premultiplied colour with the rounding offset of the /255 division folded in
+        self.premul = imgFront[:, :, 0:3] * alpha
+        self.premul += 128
+        self.invAlpha = 255 - alpha
+
+        # Scratch buffers reused by every blend, so overlaying allocates nothing
+        self._buffer = np.empty((self.h, self.w, 3), np.uint16)
+        self._carry = np.empty((self.h, self.w, 3), np.uint16)
+
+    def overlay(self, imgBack, pos=(0, 0), out=None):
+        """
+        Blend the sprite onto a background image.
+
+        :param imgBack: The background image, a NumPy array of shape (height, width, 3) or (height, width, 4).
+        :param pos: The x and y coordinates (in pixels) of the top left corner of the sprite.
+                    Can be negative or cause the sprite to go out-of-bounds.
+        :param out: Image to write the result to. If None, imgBack is modified in place.
+        :return: The image with the sprite applied (out, or imgBack if out is None).
+        """
+        if out is None:
+            out = imgBack
+        elif out is not imgBack:
+            np.copyto(out, imgBack)
+
+        hb, wb = out.shape[:2]
+        region = _overlayRegion(pos, self.w, self.h, wb, hb)
+        if region is not None:
+            self._blendRegion(out, *region[0], *region[1])
+        return out
+
+    def _blendRegion(self, out, x1, y1, x2, y2, fx, fy):
+        """
+        Blend the already clipped part of the sprite starting at (fx, fy) into out[y1:y2, x1:x2].
+        """
+        w, h = x2 - x1, y2 - y1
+
+        roi = out[y1:y2, x1:x2, 0:3]
+        buffer = self._buffer[:h, :w]
+        carry = self._carry[:h, :w]
+
+        # back * (255 - a) + front * a + 128 never exceeds 65153, so uint16 is enough
+        np.multiply(roi, self.invAlpha[fy:fy + h, fx:fx + w], out=buffer)
+        buffer += self.premul[fy:fy + h, fx:fx + w]
+
+        # Exact rounded division by 255: (v + (v >> 8)) >> 8
+        np.right_shift(buffer, 8, out=carry)
+        buffer += carry
+        buffer >>= 8
+        np.copyto(roi, buffer, casting='unsafe')
+
+
+def overlayPNG(imgBack, imgFront, pos=[0, 0], out=None):
     """
      Overlay a PNG image with transparency onto another image using alpha blending.
      The function handles out-of-bound positions, including negative coordinates, by cropping
      the overlay image accordingly. Edges are smoothed using alpha blending.
+     When the same image is overlaid repeatedly, pass a PNGSprite as imgFront so the
+     alpha preparation is done only once.
 
      :param imgBack: The background image, a NumPy array of shape (height, width, 3) or (height, width, 4).
-     :param imgFront: The foreground PNG image to overlay, a NumPy array of shape (height, width, 4).
+     :param imgFront: The foreground PNG image to overlay, a NumPy array of shape (height, width, 4),
+                      or a PNGSprite.
      :param pos: A list specifying the x and y coordinates (in pixels) at which to overlay the image.
                  Can be negative or cause the overlay image to go out-of-bounds.
-     :return: A new image with the overlay applied, a NumPy array of shape like `imgBack`.
+     :param out: Image to write the result to. If None, imgBack is modified in place.
+     :return: The image with the overlay applied, a NumPy array of shape like `imgBack`.
      """
-    hf, wf, cf = imgFront.shape
-    hb, wb, cb = imgBack.shape
-
-    x1, y1 = max(pos[0], 0), max(pos[1], 0)
-    x2, y2 = min(pos[0] + wf, wb), min(pos[1] + hf, hb)
+    if isinstance(imgFront, PNGSprite):
+        return imgFront.overlay(imgBack, pos, out=out)
 
-    # For negative positions, change the starting position in the overlay image
-    x1_overlay = 0 if pos[0] >= 0 else -pos[0]
-    y1_overlay = 0 if pos[1] >= 0 else -pos[1]
-
-    # Calculate the dimensions of the slice to overlay
-    wf, hf = x2 - x1, y2 - y1
+    hf, wf = imgFront.shape[:2]
+    hb, wb = imgBack.shape[:2]
+    region = _overlayRegion(pos, wf, hf, wb, hb)
 
     # If overlay is completely outside background, return original background
-    if wf <= 0 or hf <= 0:
+    if region is None:
+        if out is not None and out is not imgBack:
+            np.copyto(out, imgBack)
+            return out
         return imgBack
 
-    # Extract the alpha channel from the foreground and create the inverse mask
-    alpha = imgFront[y1_overlay:y1_overlay + hf, x1_overlay:x1_overlay + wf, 3] / 255.0
-    inv_alpha = 1.0 - alpha
+    if out is None:
+        out = imgBack
+    elif out is not imgBack:
+        np.copyto(out, imgBack)
 
-    # Extract the RGB channels from the foreground
-    imgRGB = imgFront[y1_overlay:y1_overlay + hf, x1_overlay:x1_overlay + wf, 0:3]
+    # One-shot blend of the visible part, without the fixed point tables of a PNGSprite
+    (x1, y1, x2, y2), (fx, fy) = region
+    front = imgFront[fy:fy + y2 - y1, fx:fx + x2 - x1]
+    alpha = front[:, :, 3].astype(np.float32)
+    alpha *= 1 / 255
+    roi = out[y1:y2, x1:x2, 0:3]
+    roi[:] = cv2.blendLinear(np.ascontiguousarray(front[:, :, 0:3]), roi, alpha, 1 - alpha)
+    return out
 
-    # Alpha blend the foreground and background
-    for c in range(0, 3):
-        imgBack[y1:y2, x1:x2, c] = imgBack[y1:y2, x1:x2, c] * inv_alpha + imgRGB[:, :, c] * alpha
 
-    return imgBack
+def overlayPNGs(imgBack, sprites, out=None):
+    """
+    Overlay many PNG images onto one background in a single call.
+    All positions are clipped together, the sprites are composited from the lowest
+    to the highest z value, and an image that appears several times is prepared only once.
+
+    :param imgBack: The background image, a NumPy array of shape (height, width, 3) or (height, width, 4).
+    :param sprites: List of (imgFront, pos) or (imgFront, pos, z) entries. imgFront is a PNG image
+                    with an alpha channel or a PNGSprite. Entries without z use z=0 and
+                    entries with equal z are drawn in list order.
+    :param out: Image to write the result to. If None, imgBack is modified in place.
+    :return: The image with all overlays applied.
+    """
+    if out is None:
+        out = imgBack
+    elif out is not imgBack:
+        np.copyto(out, imgBack)
+    if len(sprites) == 0:
+        return out
+
+    # Prepare each distinct image once
+    prepared = {}
+    spriteList = []
+    for entry in sprites:
+        imgFront = entry[0]
+        if not isinstance(imgFront, PNGSprite):
+            key = id(imgFront)
+            if key not in prepared:
+                prepared[key] = PNGSprite(imgFront)
+            imgFront = prepared[key]
+        spriteList.append(imgFront)
+
+    # Clip all sprites against the background at once
+    hb, wb = out.shape[:2]
+    pos = np.array([entry[1][:2] for entry in sprites], dtype=np.int64)
+    size = np.array([(sprite.w, sprite.h) for sprite in spriteList], dtype=np.int64)
+    z = np.array([entry[2] if len(entry) > 2 else 0 for entry in sprites])
+    start = np.maximum(pos, 0)
+    end = np.minimum(pos + size, (wb, hb))
+    offset = start - pos
+    visible = np.all(end > start, axis=1)
+
+    for i in np.argsort(z, kind='stable'):
+        if visible[i]:
+            spriteList[i]._blendRegion(out, start[i, 0], start[i, 1], end[i, 0], end[i, 1],
+                                       offset[i, 0], offset[i, 1])
+
+    return out
 
 
 def rotateImage(imgInput, angle, scale=1, keepSize=False):
@@ -260,7 +436,9 @@ def downloadImageFromUrl(url, keepTransparency=False):
     :param keep_transparency: Whether to keep the alpha channel (transparency) in the image (default: False)
     :return: The downloaded image in OpenCV format
     """
-    # Download the image using urllib
+    # Download the image using urllib, imported here as it is slow to import
+    import urllib.request
+
     url_response = urllib.request.urlopen(url)
 
     # Convert the downloaded bytes to a numpy array
@@ -275,6 +453,49 @@ def downloadImageFromUrl(url, keepTransparency=False):
     return image
 
 
+def toRGB(img, rgb=None):
+    """
+    RGB version of a BGR image for mediapipe, as a read-only contiguous array.
+    mediapipe uses read-only arrays without copying them.
+
+    :param img: BGR image
+    :param rgb: Already converted RGB image to use instead of converting img,
+                e.g. SharedFrame.rgb or a crop of it
+    :return: RGB image
+    """
+    if rgb is None:
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    elif rgb.flags.c_contiguous:
+        return rgb
+    else:
+        rgb = np.ascontiguousarray(rgb)
+    rgb.flags.writeable = False
+    return rgb
+
+
+class SharedFrame:
+    """
+    A frame that several detectors run on. The BGR to RGB conversion is done
+    once, the first time rgb is used, instead of once in every detector.
+    Pass frame.rgb as the rgb argument of findHands, findPose, findFaceMesh,
+    findFaces and removeBG. Create a new SharedFrame for every frame.
+    """
+
+    def __init__(self, img):
+        """
+        :param img: BGR image
+        """
+        self.img = img
+        self._rgb = None
+
+    @property
+    def rgb(self):
+        """Read-only RGB version of img, converted on first use."""
+        if self._rgb is None:
+            self._rgb = toRGB(self.img)
+        return self._rgb
+
+
 def main():
     cap = cv2.VideoCapture(2)
 
@@ -1,2 +1,31 @@
+import importlib
+
 from cvzone.Utils import stackImages, cornerRect, findContours,\
-    overlayPNG, rotateImage, putTextRect,downloadImageFromUrl
+    overlayPNG, rotateImage, putTextRect,downloadImageFromUrl, PNGSprite, overlayPNGs, ImageStacker, \
+    toRGB, SharedFrame
+
+# Classes that need mediapipe, tensorflow or pyserial are only imported when first used,
+# so "import cvzone" stays fast. e.g. cvzone.HandDetector imports the HandTrackingModule.
+_lazyClasses = {
+    "HandDetector": "cvzone.HandTrackingModule",
+    "PoseDetector": "cvzone.PoseModule",
+    "FaceMeshDetector": "cvzone.FaceMeshModule",
+    "FaceDetector": "cvzone.FaceDetectionModule",
+    "SelfiSegmentation": "cvzone.SelfiSegmentationModule",
+    "Classifier": "cvzone.ClassificationModule",
+    "SerialObject": "cvzone.SerialModule",
+    "LivePlot": "cvzone.PlotModule",
+    "PID": "cvzone.PIDModule",
+}
+
+
+def __getattr__(name):
+    if name in _lazyClasses:
+        value = getattr(importlib.import_module(_lazyClasses[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'cvzone' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyClasses))
@@ -0,0 +1,55 @@
+import collections
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+
+from cvzone.BenchmarkModule import ResultRecorder, loadResults, replayDetector, syntheticHandResults
+from cvzone.HandTrackingModule import HandDetector
+
+RESULTS = os.path.join(os.path.dirname(__file__), os.pardir, "Results")
+
+
+class SolutionStub:
+    """Returns results the way mediapipe does: the SolutionOutputs namedtuple class with class attributes."""
+
+    def __init__(self, results):
+        self.results = results
+        self.index = 0
+
+    def process(self, img):
+        result = self.results[self.index % len(self.results)]
+        self.index += 1
+        outputs = collections.namedtuple("SolutionOutputs", vars(result).keys())
+        for key, value in vars(result).items():
+            setattr(outputs, key, value)
+        return outputs
+
+
+def recordAndReplay(detector, frames, tmp_path):
+    recorder = ResultRecorder(detector)
+    recorded = [detector.findHands(img.copy(), draw=False)[0] for img in frames]
+    path = str(tmp_path / "hands.pkl")
+    recorder.save(path)
+
+    replayed = replayDetector(HandDetector(staticMode=True, maxHands=2), loadResults(path))
+    for img, hands in zip(frames, recorded):
+        assert replayed.findHands(img.copy(), draw=False)[0] == hands
+    return recorded
+
+
+def testRecordAndReplaySolutionOutputs(tmp_path):
+    detector = HandDetector(staticMode=True, maxHands=2)
+    detector.hands = SolutionStub([syntheticHandResults(2, seed=0), syntheticHandResults(1, seed=1)])
+    frames = [np.zeros((480, 640, 3), np.uint8)] * 2
+    recorded = recordAndReplay(detector, frames, tmp_path)
+    assert [len(hands) for hands in recorded] == [2, 1]
+
+
+def testRecordAndReplayRealSession(tmp_path):
+    img = cv2.imread(os.path.join(RESULTS, "overlayPNG.jpg"))
+    recorded = recordAndReplay(HandDetector(staticMode=True, maxHands=2), [img], tmp_path)
+    assert len(recorded[0]) == 2
@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+import pytest
+
+tensorflow = pytest.importorskip("tensorflow")
+
+from cvzone.ClassificationModule import Classifier
+
+
+@pytest.fixture(scope="module")
+def modelPath(tmp_path_factory):
+    model = tensorflow.keras.Sequential([
+        tensorflow.keras.Input((16, 16, 3)),
+        tensorflow.keras.layers.Conv2D(4, 3, activation="relu"),
+        tensorflow.keras.layers.GlobalAveragePooling2D(),
+        tensorflow.keras.layers.Dense(3, activation="softmax"),
+    ])
+    path = str(tmp_path_factory.mktemp("model") / "keras_model.h5")
+    model.save(path)
+    return path
+
+
+def makeImage():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (40, 30, 3), np.uint8)
+
+
+@pytest.mark.parametrize("backend", ["predict", "function", "tflite"])
+def testOtherChannelsAreConverted(modelPath, backend):
+    classifier = Classifier(modelPath, backend=backend)
+    img = makeImage()
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    expected, _ = classifier.getPredictions([img, cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)], asArray=True)
+
+    # Classify something else first, so a stale input tensor would give other predictions
+    classifier.getPredictions([np.zeros_like(img), np.zeros_like(img)])
+    predictions, _ = classifier.getPredictions([cv2.cvtColor(img, cv2.COLOR_BGR2BGRA), gray], asArray=True)
+    assert np.allclose(predictions, expected, atol=1e-5)
+
+
+def testUnsupportedImagesRaise(modelPath):
+    classifier = Classifier(modelPath)
+    with pytest.raises(ValueError):
+        classifier.getPrediction(np.zeros((40, 30, 2), np.uint8), draw=False)
+    with pytest.raises(ValueError):
+        classifier.getPrediction(np.zeros((40, 30, 3), np.float32), draw=False)
+
+
+def testTfliteKeepsLargestBatch(modelPath):
+    reference = Classifier(modelPath, backend="predict")
+    classifier = Classifier(modelPath, backend="tflite")
+    resizes = []
+    resize = classifier.interpreter.resize_tensor_input
+    classifier.interpreter.resize_tensor_input = lambda *args: resizes.append(args[1]) or resize(*args)
+
+    rng = np.random.default_rng(1)
+    for n in (3, 1, 2, 3, 1):
+        imgs = [rng.integers(0, 256, (40, 30, 3), np.uint8) for _ in range(n)]
+        predictions, _ = classifier.getPredictions(imgs, asArray=True)
+        expected, _ = reference.getPredictions(imgs, asArray=True)
+        assert predictions.shape == expected.shape
+        assert np.allclose(predictions, expected, atol=1e-5)
+        single, _ = classifier.getPrediction(imgs[0], draw=False)
+        assert np.allclose(single, expected[0], atol=1e-5)
+    assert len(resizes) == 1
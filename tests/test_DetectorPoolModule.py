@@ -0,0 +1,29 @@
+import numpy as np
+
+from cvzone.DetectorPoolModule import DetectorPool
+
+
+class MeanDetector:
+    def __init__(self, offset=0):
+        self.offset = offset
+
+
+def detectMean(detector, img):
+    return float(img.mean()) + detector.offset
+
+
+def makeFrames(n, shape=(8, 8, 3)):
+    return [np.full(shape, i, np.uint8) for i in range(n)]
+
+
+def testMapTwiceOnOnePool():
+    with DetectorPool(MeanDetector, detect=detectMean, processes=2, slotsPerProcess=1) as pool:
+        assert pool.map(makeFrames(5)) == [float(i) for i in range(5)]
+        assert pool.map(makeFrames(5)) == [float(i) for i in range(5)]
+
+
+def testMapAfterShapeChange():
+    with DetectorPool(MeanDetector, {"offset": 1}, detect=detectMean, processes=2) as pool:
+        assert pool.map(makeFrames(3)) == [1.0, 2.0, 3.0]
+        assert pool.map(makeFrames(3, (4, 4, 3))) == [1.0, 2.0, 3.0]
+        assert pool.map(makeFrames(3)) == [1.0, 2.0, 3.0]
@@ -0,0 +1,30 @@
+import time
+
+import pytest
+
+from cvzone.FPS import FPS
+
+
+def testPublicAttributesInSeconds(monkeypatch):
+    now = [time.perf_counter_ns()]
+    monkeypatch.setattr(time, "perf_counter_ns", lambda: now[0])
+    fpsReader = FPS(avgCount=3)
+    assert isinstance(fpsReader.pTime, float)
+    assert fpsReader.pTime == pytest.approx(now[0] / 1e9)
+    assert fpsReader.frameTimes == []
+
+    for ms in (10, 20, 30, 40):
+        now[0] += ms * 1_000_000
+        fps, img = fpsReader.update()
+    assert fpsReader.frameTimes == pytest.approx([0.02, 0.03, 0.04])
+    assert fpsReader.pTime == pytest.approx(now[0] / 1e9)
+    assert fps == pytest.approx(1 / 0.03)
+
+
+def testSettingPTime(monkeypatch):
+    now = [10_000_000_000]
+    monkeypatch.setattr(time, "perf_counter_ns", lambda: now[0])
+    fpsReader = FPS()
+    fpsReader.pTime = 9.5
+    fpsReader.update()
+    assert fpsReader.frameTimes == pytest.approx([0.5])
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+from mediapipe.framework.formats import classification_pb2, landmark_pb2
+
+from cvzone.BenchmarkModule import replayDetector
+from cvzone.FrameSkipModule import FrameSkipper
+from cvzone.HandTrackingModule import HandDetector
+
+W, H = 640, 480
+
+
+def handResults(hands):
+    """
+    :param hands: list of (type, x offset in pixels) in the order mediapipe returns them
+    """
+    landmarks, handedness = [], []
+    for handType, x in hands:
+        lmList = landmark_pb2.NormalizedLandmarkList()
+        for i in range(21):
+            lm = lmList.landmark.add()
+            lm.x, lm.y = (x + 2 * i) / W, (200 + 3 * i) / H
+        landmarks.append(lmList)
+        classification = classification_pb2.ClassificationList()
+        label = classification.classification.add()
+        # findHands flips the mediapipe label by default
+        label.label, label.score = {"Left": "Right", "Right": "Left"}[handType], 0.95
+        handedness.append(classification)
+    return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+
+
+def skippedHands(results, every=2):
+    detector = replayDetector(HandDetector(staticMode=True, maxHands=2), results)
+    skipper = FrameSkipper(detector, every=every)
+    img = np.zeros((H, W, 3), np.uint8)
+    return [skipper.find(img, draw=False)[0] for _ in range(2 * every)]
+
+
+def wristX(hands):
+    return {hand["type"]: hand["lmList"][0][0] for hand in hands}
+
+
+def testStationaryHandsReturnedSwapped():
+    frames = skippedHands([handResults([("Left", 100), ("Right", 500)]),
+                           handResults([("Right", 500), ("Left", 100)])])
+    # Frame 3 is predicted from the detections of frames 0 and 2
+    assert wristX(frames[3]) == {"Left": 100, "Right": 500}
+
+
+def testMovingHandReturnedSwapped():
+    frames = skippedHands([handResults([("Left", 100), ("Right", 500)]),
+                           handResults([("Right", 500), ("Left", 120)])])
+    assert wristX(frames[3]) == {"Left": 130, "Right": 500}
+
+
+def testNewHandIsHeldStill():
+    frames = skippedHands([handResults([("Left", 100)]),
+                           handResults([("Right", 500), ("Left", 100)])])
+    assert wristX(frames[3]) == {"Left": 100, "Right": 500}
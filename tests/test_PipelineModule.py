@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from cvzone.PipelineModule import Pipeline
+
+
+class FakeCapture:
+    def __init__(self, numFrames=None):
+        self.numFrames = numFrames
+        self.frameId = 0
+
+    def read(self):
+        if self.numFrames is not None and self.frameId >= self.numFrames:
+            return False, None
+        self.frameId += 1
+        return True, np.full((4, 4, 3), self.frameId % 256, np.uint8)
+
+    def release(self):
+        pass
+
+
+def readAll(pipeline, maxReads=100):
+    results = []
+    for _ in range(maxReads):
+        success, img, result = pipeline.read()
+        if success:
+            results.append(result)
+        elif not pipeline.running:
+            break
+    return results
+
+
+def testSourceEnds():
+    pipeline = Pipeline(FakeCapture(5), detect=lambda img: int(img[0, 0, 0])).start()
+    try:
+        results = readAll(pipeline)
+    finally:
+        pipeline.stop()
+    assert not pipeline.running
+    assert results == sorted(results) and set(results) <= {1, 2, 3, 4, 5}
+
+
+def testFailingDetectorRaises():
+    def detect(img):
+        raise RuntimeError("detector failed")
+
+    pipeline = Pipeline(FakeCapture(), detect=detect).start()
+    try:
+        with pytest.raises(RuntimeError, match="detector failed"):
+            readAll(pipeline)
+        assert not pipeline.running
+        assert not pipeline.threads[1].is_alive()
+    finally:
+        pipeline.stop()
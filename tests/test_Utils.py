@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from cvzone.Utils import ImageStacker, stackImages
+
+
+def testStackBGRAKeepsAlpha():
+    img = np.zeros((20, 30, 4), np.uint8)
+    img[:] = (10, 20, 30, 255)
+    stacked = stackImages([img, img], 2, 1)
+    assert stacked.shape == (20, 60, 4)
+    assert (stacked == (10, 20, 30, 255)).all()
+
+
+def testStackFloat():
+    img = np.full((20, 30, 3), 0.5, np.float32)
+    stacked = stackImages([img, img, img], 2, 0.5)
+    assert stacked.dtype == np.float32
+    assert stacked.shape == (20, 30, 3)
+    assert np.allclose(stacked[:, :15], 0.5) and np.allclose(stacked[10:, 15:], 0)
+
+
+def testStackMixedFormats():
+    bgr = np.full((20, 30, 3), 100, np.uint8)
+    gray = np.full((20, 30), 50, np.uint8)
+    bgra = np.full((20, 30, 4), 200, np.uint8)
+    stacker = ImageStacker(3, 1)
+    stacked = stacker.stack([bgr, gray, bgra])
+    assert stacked.shape == (20, 90, 4)
+    assert (stacked[:, :30] == (100, 100, 100, 255)).all()
+    assert (stacked[:, 30:60] == (50, 50, 50, 255)).all()
+    assert (stacked[:, 60:] == 200).all()
+    # The canvas follows the format of the inputs between calls
+    assert stacker.stack([bgr, bgr, bgr]).shape == (20, 90, 3)
+
+
+def testStackUnsupportedChannels():
+    with pytest.raises(ValueError):
+        stackImages([np.zeros((20, 30, 2), np.uint8)], 1, 1)